@@ -1,165 +1,205 @@
-# from __future__ import annotations
-# from dataclasses import dataclass, field
-# from typing import Any, Dict, List
-#
-# from core.graph_engine.nodes import BaseNode
-# from core.graph_engine.state import NeuralState
-# from core.llm.router import LLMRouter
-# from core.utils.logger import get_logger
-#
-#
-# @dataclass
-# class AgentConfig:
-#     name: str
-#     role: str
-#     goal: str
-#     backstory: str = ""
-#     constraints: List[str] = field(default_factory=list)
-#     examples: List[str] = field(default_factory=list)
-#     tools: List[str] = field(default_factory=list)
-#     capabilities: List[str] = field(default_factory=list)
-#     max_retries: int = 1
-#     timeout: int = 60
-#
-#
-# class BaseAgent(BaseNode):
-#     def __init__(self, config: AgentConfig) -> None:
-#         super().__init__(config.name)
-#         self.config = config
-#         self.router = LLMRouter()
-#         self.logger = get_logger(f"Agent.{config.name}")
-#
-#     async def _build_user_prompt(self, state: NeuralState) -> str:
-#         raise NotImplementedError
-#
-#     async def _process_response(self, response: Any, state: NeuralState) -> str:
-#         return getattr(response, "content", str(response))
-#
-#     def _build_system_prompt(self, state: NeuralState) -> str:
-#         lines = [
-#             f"You are {self.config.name}, a {self.config.role}.",
-#             f"GOAL: {self.config.goal}",
-#         ]
-#         if self.config.backstory:
-#             lines.append(f"BACKSTORY: {self.config.backstory}")
-#         if self.config.capabilities:
-#             lines.append("CAPABILITIES:")
-#             lines.extend(f"- {c}" for c in self.config.capabilities)
-#         if self.config.constraints:
-#             lines.append("CONSTRAINTS:")
-#             lines.extend(f"- {c}" for c in self.config.constraints)
-#         if self.config.tools:
-#             lines.append(f"TOOLS AVAILABLE: {', '.join(self.config.tools)}")
-#         return "\n".join(lines)
-#
-#     async def execute(self, state: NeuralState) -> NeuralState:
-#         self.logger.info(
-#             "Starting agent execution",
-#             extra={"run_id": state.run_id, "step": state.step},
-#         )
-#
-#         system_msg = {"role": "system", "content": self._build_system_prompt(state)}
-#         user_content = await self._build_user_prompt(state)
-#         user_msg = {"role": "user", "content": user_content}
-#
-#         messages: List[Dict[str, Any]] = [system_msg] + state.messages + [user_msg]
-#         response = await self.router.route(state, messages=messages)
-#         result_content = await self._process_response(response, state)
-#
-#         state.add_message(
-#             role="assistant",
-#             content=result_content,
-#             name=self.config.name,
-#             metadata={
-#                 "model": getattr(response, "model", None),
-#                 "provider": getattr(response, "provider", None),
-#                 "latency": getattr(response, "latency", None),
-#             },
-#         )
-#
-#         self.logger.info(
-#             "Agent execution finished",
-#             extra={"run_id": state.run_id, "step": state.step},
-#         )
-#         return state
-#
-#     async def run(self, state: NeuralState) -> NeuralState:
-#         return await self.execute(state)
-
-
-
-# agents/base/base_agent.py (sadece değişen kısım)
+# agents/base/base_agent.py
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Any, Dict, List
-from pathlib import Path  # ← yeni import
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
 from core.graph_engine.nodes import BaseNode
 from core.graph_engine.state import NeuralState
-from core.llm.router import LLMRouter
+from core.llm.router import get_router
 from core.utils.logger import get_logger
 
+try:
+    from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
-@dataclass
+    TENACITY_AVAILABLE = True
+except ImportError:
+    TENACITY_AVAILABLE = False
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+# Exact-match yanıt cache'i: aynı (system, history, user) üçlüsü tekrar LLM'e gitmez.
+# Tüm agent'lar paylaşır; anahtar mesaj listesinin hash'i. Yalnızca cacheable=True
+# olan (aynı hedefe aynı plan: Supervisor/Architect) agent'lar kullanır.
+_RESPONSE_CACHE: Dict[int, Any] = {}
+_RESPONSE_CACHE_MAX = 256
+
+
+def _cache_key(messages: List[Dict[str, Any]]) -> int:
+    # Kriptografik güç gerekmiyor: varsa C serializer (orjson) + SIMD hash (xxh3).
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(messages, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        payload = json.dumps(messages, sort_keys=True, default=str).encode("utf-8")
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_intdigest(payload)
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=16).digest(), "little")
+
+
+class _ErrorResponse(Exception):
+    """Router hatayı yutup ``model="error"`` yanıtı döndürdüğünde retry'ı tetikler."""
+
+    def __init__(self, response: Any) -> None:
+        super().__init__(getattr(response, "content", ""))
+        self.response = response
+
+
+_RETRYABLE = (httpx.HTTPError, asyncio.TimeoutError, _ErrorResponse)
+
+
+@dataclass(frozen=True, slots=True)
 class AgentConfig:
     name: str
     role: str
     goal: str
     backstory: str = ""
-    constraints: List[str] = field(default_factory=list)
-    examples: List[str] = field(default_factory=list)
-    tools: List[str] = field(default_factory=list)
-    capabilities: List[str] = field(default_factory=list)
+    constraints: Tuple[str, ...] = ()
+    examples: Tuple[str, ...] = ()
+    tools: Tuple[str, ...] = ()
+    capabilities: Tuple[str, ...] = ()
     max_retries: int = 1
-    timeout: int = 60
+    timeout: Optional[float] = None  # None: provider varsayılanı (OpenAI 60 sn, Ollama 120 sn)
     output_dir: str = "output"
+    cacheable: bool = False  # aynı prompt'a aynı yanıt kabul edilebilirse True
+    # LLMRouter transport hatalarını yutup ``model="error"`` yanıtı döndürür; max_retries'ın
+    # işlemesi için bu yanıtlar da tekrar denenir. False: yalnızca yükseltilen httpx/timeout hataları.
+    retry_on_error_response: bool = True
+
+
+@functools.lru_cache(maxsize=64)
+def _render_system_prompt(config: AgentConfig) -> str:
+    lines = [
+        f"You are {config.name}, a {config.role}.",
+        f"GOAL: {config.goal}",
+    ]
+    if config.backstory:
+        lines.append(f"BACKSTORY: {config.backstory}")
+    if config.capabilities:
+        lines.append("CAPABILITIES:")
+        lines.extend(f"- {c}" for c in config.capabilities)
+    if config.constraints:
+        lines.append("CONSTRAINTS:")
+        lines.extend(f"- {c}" for c in config.constraints)
+    if config.tools:
+        lines.append(f"TOOLS AVAILABLE: {', '.join(config.tools)}")
+    return "\n".join(lines)
 
 
 class BaseAgent(BaseNode):
+    __slots__ = (
+        "config", "router", "logger", "_log_extra", "_system_prompt", "_system_msg",
+    )
+
     def __init__(self, config: AgentConfig) -> None:
         super().__init__(config.name)
         self.config = config
-        self.router = LLMRouter()
+        self.router = get_router()
         self.logger = get_logger(f"Agent.{config.name}")
+        self._log_extra = {"agent": config.name}
+        # Config init'ten sonra değişmiyor: system prompt'u bir kez üret,
+        # her çağrıda byte-byte aynı kalsın (provider prompt cache'i için).
+        self._system_prompt = self._render_system_prompt()
+        self._system_msg = {"role": "system", "content": self._system_prompt}
 
     async def _build_user_prompt(self, state: NeuralState) -> str:
         raise NotImplementedError
 
+    def _should_skip(self, state: NeuralState) -> Optional[str]:
+        """LLM'e gitmeden yanıtlanabilecek durumlar için mesaj döndürür (varsayılan: boş hedef)."""
+        if not state.goal.strip():
+            return "NO_OP: Empty goal."
+        return None
+
     async def _process_response(self, response: Any, state: NeuralState) -> str:
-        # --- YENİ: Path uyumluluğu ---
-        if hasattr(self, 'output_dir') and self.output_dir:
-            Path(self.output_dir).mkdir(parents=True, exist_ok=True)
-        # --- YENİ: Path uyumluluğu ---
         return getattr(response, "content", str(response))
 
+    def _render_system_prompt(self) -> str:
+        return _render_system_prompt(self.config)
+
     def _build_system_prompt(self, state: NeuralState) -> str:
-        lines = [
-            f"You are {self.config.name}, a {self.config.role}.",
-            f"GOAL: {self.config.goal}",
-        ]
-        if self.config.backstory:
-            lines.append(f"BACKSTORY: {self.config.backstory}")
-        if self.config.capabilities:
-            lines.append("CAPABILITIES:")
-            lines.extend(f"- {c}" for c in self.config.capabilities)
-        if self.config.constraints:
-            lines.append("CONSTRAINTS:")
-            lines.extend(f"- {c}" for c in self.config.constraints)
-        if self.config.tools:
-            lines.append(f"TOOLS AVAILABLE: {', '.join(self.config.tools)}")
-        return "\n".join(lines)
+        return self._system_prompt
+
+    def _apply_skip(self, state: NeuralState) -> bool:
+        skip = self._should_skip(state)
+        if skip is None:
+            return False
+        self._log_info(state, "Skipping LLM call: %.80s", skip)
+        state.add_message(role="assistant", content=skip, name=self.config.name)
+        return True
+
+    def _log_info(self, state: NeuralState, msg: str, *args: Any) -> None:
+        # INFO kapalıyken extra dict'i ve mesaj formatlamayı hiç yapma.
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(msg, *args, extra={**self._log_extra, "run_id": state.run_id})
 
     async def execute(self, state: NeuralState) -> NeuralState:
-        self.logger.info(
-            "Starting agent execution",
-            extra={"run_id": state.run_id, "step": state.step},
-        )
+        self._log_info(state, "Starting agent execution (step=%s)", state.step)
+
+        if self._apply_skip(state):
+            return state
+
+        messages = await self._build_messages(state)
+        response = await self._route_cached(state, messages)
+        await self._finalize(state, response)
+
+        self._log_info(state, "Agent execution finished (step=%s)", state.step)
+        return state
+
+    async def execute_batch(self, states: List[NeuralState]) -> List[NeuralState]:
+        """Birden çok state'in prompt'larını tek bir router batch'i olarak gönderir.
+
+        Cache'te olanlar atlanır; yanıtlar state sırasıyla eşlenir.
+        """
+        all_states = states
+        states = [s for s in states if not self._apply_skip(s)]
+        prepared = await asyncio.gather(*(self._build_messages(s) for s in states))
+
+        responses: List[Any] = [None] * len(states)
+        keys: List[Optional[int]] = [None] * len(states)
+        pending: List[int] = []
+        for i, messages in enumerate(prepared):
+            keys[i], responses[i] = self._cache_lookup(messages)
+            if responses[i] is None:
+                pending.append(i)
+
+        if pending:
+            fresh = await self.router.route_batch(
+                [states[i] for i in pending],
+                messages_list=[prepared[i] for i in pending],
+                timeout=self.config.timeout,
+            )
+            for i, response in zip(pending, fresh):
+                self._cache_store(keys[i], response)
+                responses[i] = response
 
-        system_msg = {"role": "system", "content": self._build_system_prompt(state)}
-        user_content = await self._build_user_prompt(state)
-        user_msg = {"role": "user", "content": user_content}
+        for state, response in zip(states, responses):
+            await self._finalize(state, response)
+        return all_states
 
-        messages: List[Dict[str, Any]] = [system_msg] + state.messages + [user_msg]
-        response = await self.router.route(state, messages=messages)
+    async def _build_messages(self, state: NeuralState) -> List[Dict[str, Any]]:
+        system_msg = self._system_msg
+        user_msg = {"role": "user", "content": await self._build_user_prompt(state)}
+        return [system_msg, *(m.to_wire() for m in state.messages), user_msg]
+
+    async def _finalize(self, state: NeuralState, response: Any) -> None:
         result_content = await self._process_response(response, state)
 
         state.add_message(
@@ -173,11 +213,62 @@ class BaseAgent(BaseNode):
             },
         )
 
-        self.logger.info(
-            "Agent execution finished",
-            extra={"run_id": state.run_id, "step": state.step},
-        )
-        return state
+    async def _route_cached(self, state: NeuralState, messages: List[Dict[str, Any]]) -> Any:
+        key, cached = self._cache_lookup(messages)
+        if cached is not None:
+            self._log_info(state, "Response cache hit")
+            return cached
+
+        response = await self._route_with_retry(state, messages)
+        self._cache_store(key, response)
+        return response
+
+    async def _route_once(self, state: NeuralState, messages: List[Dict[str, Any]]) -> Any:
+        response = await self.router.route(state, messages=messages, timeout=self.config.timeout)
+        if self.config.retry_on_error_response and getattr(response, "model", None) == "error":
+            raise _ErrorResponse(response)
+        return response
+
+    async def _route_with_retry(self, state: NeuralState, messages: List[Dict[str, Any]]) -> Any:
+        # messages dışarıda hazırlanır; retry'lar _build_user_prompt'u tekrar çağırmaz.
+        attempts = self.config.max_retries + 1
+        try:
+            if TENACITY_AVAILABLE:
+                async for attempt in AsyncRetrying(
+                    stop=stop_after_attempt(attempts),
+                    wait=wait_exponential_jitter(initial=0.2, max=5.0),
+                    retry=retry_if_exception_type(_RETRYABLE),
+                    reraise=True,
+                ):
+                    with attempt:
+                        return await self._route_once(state, messages)
+
+            for attempt in range(attempts):
+                try:
+                    return await self._route_once(state, messages)
+                except _RETRYABLE:
+                    if attempt == attempts - 1:
+                        raise
+                    self.logger.warning("LLM call failed, retrying", extra={"run_id": state.run_id})
+                    await asyncio.sleep(min(5.0, 0.2 * 2 ** attempt) + random.uniform(0, 0.2))
+        except _ErrorResponse as e:
+            # Son deneme de hata yanıtı: eski davranış gibi yanıtı olduğu gibi döndür.
+            return e.response
+
+    def _cache_lookup(self, messages: List[Dict[str, Any]]) -> Tuple[Optional[int], Any]:
+        if not self.config.cacheable:
+            return None, None
+
+        key = _cache_key(messages)
+        return key, _RESPONSE_CACHE.get(key)
+
+    def _cache_store(self, key: Optional[int], response: Any) -> None:
+        # Hata yanıtlarını cache'leme; bir sonraki çağrı tekrar denesin.
+        if key is None or getattr(response, "model", None) == "error":
+            return
+        if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAX:
+            _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)))
+        _RESPONSE_CACHE[key] = response
 
     async def run(self, state: NeuralState) -> NeuralState:
-        return await self.execute(state)
\ No newline at end of file
+        return await self.execute(state)
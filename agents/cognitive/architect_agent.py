@@ -1,33 +1,56 @@
 from __future__ import annotations
 
+import hashlib
+from string import Template
+from typing import Optional
+
 from agents.base.base_agent import AgentConfig, BaseAgent
 from core.graph_engine.state import NeuralState
 
+_PROMPT_TMPL = Template("""Overall goal: $goal
+
+High-level plan:
+$plan
+
+Design a minimal architecture for this. 
+Return a markdown list of files and their responsibilities.""")
+
+
+def _plan_digest(plan: str) -> str:
+    return hashlib.blake2b(plan.encode("utf-8"), digest_size=8).hexdigest()
+
 
 class ArchitectAgent(BaseAgent):
+    __slots__ = ()
+
+    _CONFIG = AgentConfig(
+        name="Architect",
+        role="software architect",
+        goal="Design a minimal but extensible file and component layout.",
+        constraints=(
+            "Prefer small, focused modules",
+            "Focus on clarity over cleverness",
+        ),
+        # Aynı hedef için plan/tasarım yeniden üretilmez: yanıt cache'ini kullan
+        cacheable=True,
+    )
+
     def __init__(self) -> None:
-        config = AgentConfig(
-            name="Architect",
-            role="software architect",
-            goal="Design a minimal but extensible file and component layout.",
-            constraints=[
-                "Prefer small, focused modules",
-                "Focus on clarity over cleverness",
-            ],
-        )
-        super().__init__(config)
+        super().__init__(self._CONFIG)
+
+    def _should_skip(self, state: NeuralState) -> Optional[str]:
+        # Aynı plan için manifest zaten üretildiyse tekrar tasarlama.
+        manifest = state.artifacts.get("manifest")
+        if manifest and state.artifacts.get("manifest_plan") == _plan_digest(state.artifacts.get("plan", "")):
+            return manifest
+        return super()._should_skip(state)
 
     async def _build_user_prompt(self, state: NeuralState) -> str:
         plan = state.artifacts.get("plan", "")
-        return f"""Overall goal: {state.goal}
-
-High-level plan:
-{plan}
-
-Design a minimal architecture for this. 
-Return a markdown list of files and their responsibilities."""
+        return _PROMPT_TMPL.substitute(goal=state.goal, plan=plan)
 
     async def _process_response(self, response, state: NeuralState) -> str:
         manifest = response.content.strip()
         state.artifacts["manifest"] = manifest
+        state.artifacts["manifest_plan"] = _plan_digest(state.artifacts.get("plan", ""))
         return manifest
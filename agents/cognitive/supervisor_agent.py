@@ -1,27 +1,36 @@
 from __future__ import annotations
 
+from string import Template
+
 from agents.base.base_agent import AgentConfig, BaseAgent
 from core.graph_engine.state import NeuralState
 
+_PROMPT_TMPL = Template("""User goal: $goal
+
+Produce a numbered list of development steps to achieve this goal.
+Each step should be one short sentence.""")
+
 
 class SupervisorAgent(BaseAgent):
+    __slots__ = ()
+
+    _CONFIG = AgentConfig(
+        name="Supervisor",
+        role="orchestrator",
+        goal="Break the overall goal into concrete, sequential development steps.",
+        constraints=(
+            "Keep steps between 3 and 7",
+            "Each step should be unambiguous",
+        ),
+        # Aynı hedef için plan/tasarım yeniden üretilmez: yanıt cache'ini kullan
+        cacheable=True,
+    )
+
     def __init__(self) -> None:
-        config = AgentConfig(
-            name="Supervisor",
-            role="orchestrator",
-            goal="Break the overall goal into concrete, sequential development steps.",
-            constraints=[
-                "Keep steps between 3 and 7",
-                "Each step should be unambiguous",
-            ],
-        )
-        super().__init__(config)
+        super().__init__(self._CONFIG)
 
     async def _build_user_prompt(self, state: NeuralState) -> str:
-        return f"""User goal: {state.goal}
-
-Produce a numbered list of development steps to achieve this goal.
-Each step should be one short sentence."""
+        return _PROMPT_TMPL.substitute(goal=state.goal)
 
     async def _process_response(self, response, state: NeuralState) -> str:
         plan = response.content.strip()
@@ -1,8 +1,15 @@
 # agents/technical/debugger_agent.py
-from typing import Any
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
 from agents.base.base_agent import BaseAgent, AgentConfig
-from core.graph_engine.state import NeuralState
-from core.self_healing.engine import SelfHealingEngine
+from core.graph_engine.state import NeuralState, StateDelta
+from core.self_healing.engine import ErrorDiagnosis, SelfHealingEngine
+from core.utils.code_fence import extract_code
+
+_DIAGNOSIS_CACHE_MAX = 64
+_SKIP_PASSED = "NO_OP: Tests passed. No action required."
 
 
 class DebuggerAgent(BaseAgent):
@@ -11,25 +18,69 @@ class DebuggerAgent(BaseAgent):
     Uses SelfHealingEngine to classify errors and generate repair strategies.
     """
 
+    _CONFIG = AgentConfig(
+        name="DebuggerAgent",
+        role="Senior Debugger & Code Fixer",
+        goal="Analyze error logs, understand root causes, and apply fixes.",
+        backstory=(
+            "You are an expert debugger. You don't just guess; you analyze stack traces, "
+            "identify the exact line of failure, and provide surgical code fixes."
+        ),
+        constraints=(
+            "Return ONLY the fixed code block",
+            "Do not explain unless necessary",
+            "Maintain existing code structure",
+        ),
+        examples=("Fix syntax errors", "Resolve import errors", "Fix logic bugs")
+    )
+
     def __init__(self):
-        config = AgentConfig(
-            name="DebuggerAgent",
-            role="Senior Debugger & Code Fixer",
-            goal="Analyze error logs, understand root causes, and apply fixes.",
-            backstory=(
-                "You are an expert debugger. You don't just guess; you analyze stack traces, "
-                "identify the exact line of failure, and provide surgical code fixes."
-            ),
-            constraints=[
-                "Return ONLY the fixed code block",
-                "Do not explain unless necessary",
-                "Maintain existing code structure"
-            ],
-            examples=["Fix syntax errors", "Resolve import errors", "Fix logic bugs"]
-        )
-        super().__init__(config)
+        super().__init__(self._CONFIG)
         # Sprint 3'te oluşturduğumuz motoru yüklüyoruz
         self.engine = SelfHealingEngine()
+        # (error_log, code) -> teşhis. Döngüde aynı hata/kod çifti sık tekrar eder.
+        self._diagnosis_cache: "OrderedDict[bytes, ErrorDiagnosis]" = OrderedDict()
+        self._diagnosis_hits = 0
+        self._diagnosis_misses = 0
+
+    async def execute(self, state: NeuralState) -> NeuralState:
+        """
+        Tek dosyada normal akış. Birden fazla dosya varsa her dosya için bir fork
+        açılır ve tüm düzeltme prompt'ları tek batch halinde gönderilir.
+        """
+        code_map = state.artifacts.get("generated_code", {})
+        skip = self._should_skip(state)
+        if skip == _SKIP_PASSED:
+            self._log_info(state, "✅ Tests passed. No debugging needed.")
+        if len(code_map) <= 1 or skip is not None:
+            return await super().execute(state)
+
+        forks = []
+        for filename, code in code_map.items():
+            fork = state.fork()
+            fork.artifacts["generated_code"] = {filename: code}
+            forks.append(fork)
+
+        await self.execute_batch(forks)
+
+        # Fork'lar LLM beklerken birbirine dokunmaz; yazılar burada tek delta olarak birleşir.
+        delta = StateDelta(artifacts_set={"generated_code": {}})
+        for fork in forks:
+            delta.artifacts_set["generated_code"].update(fork.artifacts.get("generated_code", {}))
+            delta.messages.extend(fork.delta.messages)
+            delta.errors.extend(fork.delta.errors)
+            if "test_results" not in fork.artifacts:
+                delta.artifacts_del.add("test_results")
+        state.apply(delta)
+        return state
+
+    def _should_skip(self, state: NeuralState) -> Optional[str]:
+        # Testler geçtiyse veya kod yoksa LLM çağrısına gerek yok. Saf: log execute'ta.
+        if state.artifacts.get("test_results", {}).get("success", False):
+            return _SKIP_PASSED
+        if not state.artifacts.get("generated_code"):
+            return "NO_OP: No code found to debug."
+        return None
 
     async def _build_user_prompt(self, state: NeuralState) -> str:
         """
@@ -38,37 +89,56 @@ class DebuggerAgent(BaseAgent):
         2. Hata varsa SelfHealingEngine'den teşhis ve prompt ister.
         """
 
-        # 1. Test Sonuçlarını Kontrol Et
+        # 1. Hatayı ve Kodu Al (başarılı test / boş kod durumu _should_skip'te)
         test_res = state.artifacts.get("test_results", {})
-
-        # Eğer testler başarılıysa veya hiç test yoksa
-        if test_res.get("success", False):
-            self.logger.info("✅ Tests passed. No debugging needed.")
-            return "NO_OP: Tests passed. No action required."
-
-        # 2. Hatayı ve Kodu Al
         error_msg = test_res.get("output", "Unknown Error")
 
         code_map = state.artifacts.get("generated_code", {})
-        if not code_map:
-            return "NO_OP: No code found to debug."
 
         # İlk dosyayı al (MVP için)
         filename, code = list(code_map.items())[0]
 
-        # 3. Motoru Kullanarak Teşhis Koy (Diagnosis)
+        # 2. Motoru Kullanarak Teşhis Koy (Diagnosis)
         # Bu, hatanın türünü (Syntax, Logic, Import) belirler
-        diagnosis = self.engine.diagnose(error_msg, code)
+        diagnosis = self._diagnose(error_msg, code)
 
-        self.logger.info(
-            f"🚑 Diagnosis: {diagnosis.type.value}",
-            extra={"file": filename, "details": diagnosis.details}
-        )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "🚑 Diagnosis: %s",
+                diagnosis.type.value,
+                extra={"file": filename, "details": diagnosis.details},
+            )
 
-        # 4. Motorun ürettiği "Akıllı Prompt"u döndür
+        # 3. Motorun ürettiği "Akıllı Prompt"u döndür
         # Örn: "Fix Syntax Error in line 5..."
         return diagnosis.fix_prompt
 
+    def _diagnose(self, error_msg: str, code: str) -> ErrorDiagnosis:
+        """``engine.diagnose`` için sınırlı LRU; isabet oranı çok düşükse cache kapanır."""
+        cache = self._diagnosis_cache
+        # Thrashing koruması: çok miss ve <%10 isabette cache'i atla
+        if self._diagnosis_misses > 2 * _DIAGNOSIS_CACHE_MAX and (
+            self._diagnosis_hits * 10 < self._diagnosis_hits + self._diagnosis_misses
+        ):
+            return self.engine.diagnose(error_msg, code)
+
+        key = (
+            hashlib.blake2b(error_msg.encode("utf-8"), digest_size=16).digest()
+            + hashlib.blake2b(str(code).encode("utf-8"), digest_size=16).digest()
+        )
+        diagnosis = cache.get(key)
+        if diagnosis is not None:
+            self._diagnosis_hits += 1
+            cache.move_to_end(key)
+            return diagnosis
+
+        self._diagnosis_misses += 1
+        diagnosis = self.engine.diagnose(error_msg, code)
+        cache[key] = diagnosis
+        if len(cache) > _DIAGNOSIS_CACHE_MAX:
+            cache.popitem(last=False)
+        return diagnosis
+
     async def _process_response(self, response: Any, state: NeuralState) -> str:
         """
         LLM'den gelen düzeltilmiş kodu işler ve State'i günceller.
@@ -80,32 +150,25 @@ class DebuggerAgent(BaseAgent):
             return content
 
         # 1. Markdown Temizliği (Kod Bloğunu Ayıkla)
-        fixed_code = content
-        if "```" in content:
-            parts = content.split("```")
-            # Genelde: [0] text, [1] code, [2] text
-            if len(parts) >= 2:
-                # python/javascript gibi dil etiketlerini temizle
-                fixed_code = parts[1].replace("python", "").replace("javascript", "").strip()
+        fixed_code = extract_code(content)
 
         # 2. Patch Uygulama (State Artifact Güncelleme)
-        code_map = state.artifacts.get("generated_code", {})
-        if code_map:
-            filename = list(code_map.keys())[0]
+        delta = self._fix_delta(fixed_code, state)
+        if delta is None:
+            return "Could not apply fix: No source file found."
 
-            # Yeni artifact sözlüğü oluştur (Immutable prensibi için kopya)
-            new_artifacts = state.artifacts.copy()
+        state.apply(delta)
+        filename = next(iter(delta.artifacts_set["generated_code"]))
+        return f"Applied fix to '{filename}'. Ready for re-test.\nPreview: {fixed_code[:50]}..."
 
-            # Kodu güncelle
-            new_artifacts["generated_code"] = {filename: fixed_code}
-
-            # Test sonuçlarını SİL (Ki pipeline döngüsünde tekrar test edilsin)
-            if "test_results" in new_artifacts:
-                del new_artifacts["test_results"]
-
-            # State'i güncelle
-            state.artifacts = new_artifacts
-
-            return f"Applied fix to '{filename}'. Ready for re-test.\nPreview: {fixed_code[:50]}..."
-
-        return "Could not apply fix: No source file found."
\ No newline at end of file
+    def _fix_delta(self, fixed_code: str, state: NeuralState) -> Optional[StateDelta]:
+        """State'i okur, değiştirmez: düzeltmeyi bir StateDelta olarak döndürür."""
+        code_map = state.artifacts.get("generated_code", {})
+        if not code_map:
+            return None
+        filename = next(iter(code_map))
+        # Test sonuçlarını SİL (Ki pipeline döngüsünde tekrar test edilsin)
+        return StateDelta(
+            artifacts_set={"generated_code": {filename: fixed_code}},
+            artifacts_del={"test_results"},
+        )
\ No newline at end of file
@@ -1,22 +1,26 @@
 # agents/technical/tester_agent.py
 from agents.base.base_agent import BaseAgent, AgentConfig
 from core.graph_engine.state import NeuralState
+from core.utils.compile_cache import compile_cached
 from core.utils.logger import get_logger
 
 logger = get_logger("TesterAgent")
 
 
 class TesterAgent(BaseAgent):
+    __slots__ = ()
+
+    _CONFIG = AgentConfig(
+        name="TesterAgent",
+        role="QA Engineer",
+        goal="Validate code syntax and logic.",
+        backstory="You are a meticulous tester. You check both syntax (compile) and logic (review).",
+        constraints=("Check syntax errors", "Review logic flaws")
+    )
+
     def __init__(self):
         # DÜZELTME: Parametresiz init. Config içeride tanımlanıyor.
-        config = AgentConfig(
-            name="TesterAgent",
-            role="QA Engineer",
-            goal="Validate code syntax and logic.",
-            backstory="You are a meticulous tester. You check both syntax (compile) and logic (review).",
-            constraints=["Check syntax errors", "Review logic flaws"]
-        )
-        super().__init__(config)
+        super().__init__(self._CONFIG)
 
     async def _build_user_prompt(self, state: NeuralState) -> str:
         # Kodları Artifacts'ten al
@@ -48,11 +52,11 @@ class TesterAgent(BaseAgent):
 
         code_map = state.artifacts.get("generated_code", {})
         for filename, code in code_map.items():
-            try:
-                # Kodu çalıştırmadan sadece derlemeyi dene (Syntax Check)
-                compile(code, filename, 'exec')
-                logger.info(f"✅ Syntax Check Passed: {filename}")
-            except SyntaxError as e:
+            # Kodu çalıştırmadan sadece derlemeyi dene (Syntax Check); aynı kaynak cache'ten gelir
+            _, e = compile_cached(code, filename)
+            if e is None:
+                logger.info("✅ Syntax Check Passed: %s", filename)
+            else:
                 syntax_passed = False
                 msg = f"SyntaxError in {filename}: line {e.lineno}, {e.msg}"
                 syntax_errors.append(msg)
@@ -67,12 +71,10 @@ class TesterAgent(BaseAgent):
         final_success = syntax_passed and logic_passed
 
         # Test Sonucunu Kaydet
-        new_artifacts = state.artifacts.copy()
-        new_artifacts["test_results"] = {
+        state.artifacts["test_results"] = {
             "success": final_success,
             "output": f"Syntax: {'OK' if syntax_passed else 'FAIL'}. Logic: {'OK' if logic_passed else 'FAIL'}.\nDetails: {llm_content}\nSyntax Errors: {syntax_errors}"
         }
-        state.artifacts = new_artifacts
 
         status_msg = "TESTS PASSED" if final_success else "TESTS FAILED"
         if not syntax_passed:
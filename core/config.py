@@ -8,14 +8,31 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     OPENAI_API_KEY: Optional[str] = None
     OLLAMA_BASE_URL: str = "http://localhost:11434/v1"
+    # Eşzamanlı istek sınırları (Ollama sunucusundaki OLLAMA_NUM_PARALLEL ile aynı tutulmalı)
+    OLLAMA_NUM_PARALLEL: int = 4
+    OPENAI_NUM_PARALLEL: int = 32
+    OPENAI_RPM_LIMIT: int = 0  # 0 = kapalı; aiolimiter kuruluysa dakikalık istek sınırı
+
+    # Çalıştırmalar arası LLM yanıt cache'i (diskcache kuruluysa). Varsayılan kapalı:
+    # açıkken aynı prompt TTL boyunca hep aynı (ilk) yanıtı alır.
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_DIR: str = "data/cache/llm"
+    LLM_CACHE_TTL: int = 86400
     DEFAULT_CLOUD_MODEL: str = "gpt-4o"
     DEFAULT_LOCAL_MODEL: str = "llama3"
     MAX_TOKENS: int = 4000
     MAX_RETRIES: int = 3
     TIMEOUT: int = 60
+    MAX_EXECUTION_TIME: int = 600  # graph çalıştırması için toplam süre sınırı (saniye)
     MAX_SWARM_ROUNDS: int = 5
+    MAX_NODE_VISITS: int = 5  # graph döngülerinde tek bir node'un en fazla kaç kez çalışabileceği
+    MAX_MESSAGES: int = 10000  # state.messages / state.errors üst sınırı (eskiler düşer)
+    MESSAGE_WINDOW: int = 50  # swarm turları arasında prompt'a giden son mesaj sayısı; eskiler özetlenir
     CONSENSUS_THRESHOLD: float = 0.8
     ENABLE_SELF_HEALING: bool = True
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+    # Ayarlar import'ta bir kez okunur ve değişmez; modüller sık okunanları sabitlere alabilir.
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", extra="ignore", frozen=True
+    )
 
 settings = Settings()
@@ -1,35 +1,200 @@
 import asyncio
-from typing import Dict
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from core.config import settings
+from core.utils.logger import get_logger
 from .state import NeuralState
 from .node import BaseNode
 
+logger = get_logger("GraphEngine")
+
+# Settings frozen: döngüde okunan değerler import'ta sabitlenir.
+_MAX_EXECUTION_TIME = settings.MAX_EXECUTION_TIME
+_MAX_NODE_VISITS = settings.MAX_NODE_VISITS
+
+
+@dataclass(slots=True, frozen=True)
+class Edge:
+    source: str
+    target: str
+    condition: Optional[Callable[[NeuralState], bool]] = None
+    # Aynı gruptaki kenarlar birlikte (TaskGroup ile) çalıştırılır
+    parallel_group: Optional[str] = None
+
+
 class GraphEngine:
     def __init__(self):
         self.nodes: Dict[str, BaseNode] = {}
-        self.edges: Dict[str, str] = {}
+        # Adjacency: node -> çıkan kenarlar (eklenme sırasıyla); adım başına O(deg)
+        self.edges: Dict[str, List[Edge]] = defaultdict(list)
         self.start_node = None
 
     def register_node(self, node: BaseNode):
         self.nodes[node.name] = node
 
-    def add_edge(self, from_node: str, to_node: str):
-        self.edges[from_node] = to_node
+    def add_edge(
+        self,
+        from_node: str,
+        to_node: str,
+        condition: Optional[Callable[[NeuralState], bool]] = None,
+        parallel_group: Optional[str] = None,
+    ):
+        """Kenar ekler.
+
+        Koşulsuz (ve paralel olmayan) kenar kaynağın varsayılan ardılıdır: aynı
+        kaynağa tekrar eklenirse öncekinin yerine geçer (son eklenen kazanır) ve
+        her zaman listenin sonunda durur. Koşullu/paralel kenarlar eklenme
+        sırasıyla varsayılandan önce denenir.
+        """
+        edges = self.edges[from_node]
+        edge = Edge(from_node, to_node, condition, parallel_group)
+        default = next(
+            (i for i, e in enumerate(edges) if e.condition is None and e.parallel_group is None),
+            None,
+        )
+        if condition is None and parallel_group is None:
+            if default is not None:
+                del edges[default]
+            edges.append(edge)
+        elif default is not None:
+            edges.insert(default, edge)
+        else:
+            edges.append(edge)
 
     def set_start(self, name: str):
         self.start_node = name
 
+    def _next_edges(self, current_name: str, state: NeuralState) -> List[Edge]:
+        """Sıradaki kenar(lar).
+
+        İlk koşulu sağlayan (veya koşulsuz) kenar kazanır; o kenar bir
+        ``parallel_group``'a aitse, gruptaki koşulu sağlayan tüm kenarlar döner.
+        """
+        first = None
+        group: List[Edge] = []
+        for edge in self.edges.get(current_name, ()):
+            if first is not None and edge.parallel_group != first.parallel_group:
+                continue
+            if edge.condition is None or edge.condition(state):
+                if first is None:
+                    first = edge
+                    if edge.parallel_group is None:
+                        return [edge]
+                group.append(edge)
+        return group
+
+    def _next_node(self, current_name: str, state: NeuralState) -> Optional[str]:
+        edges = self._next_edges(current_name, state)
+        return edges[0].target if edges else None
+
+    async def _run_node(self, name: str, node: BaseNode, state: NeuralState) -> Tuple[NeuralState, bool]:
+        """Node'u çalıştırır; hata fırlatırsa ``state.errors``'a yazar ve False döner."""
+        try:
+            return await node.run(state), True
+        except Exception as e:
+            logger.exception("❌ Node failed: %s", name, extra={"run_id": state.run_id, "node": name})
+            state.add_error(
+                "node_error",
+                f"Node '{name}' failed: {e}",
+                {"node": name, "exception": type(e).__name__},
+            )
+            return state, False
+
+    async def _run_subgraph(self, name: str, state: NeuralState) -> Tuple[NeuralState, bool]:
+        """Paralel dalda tek bir node'u fork edilmiş state üzerinde çalıştırır."""
+        node = self.nodes.get(name)
+        if not node:
+            return state, True
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "⚙️  Running Node (parallel): %s",
+                name,
+                extra={"run_id": state.run_id, "node": name, "step": state.step},
+            )
+        return await self._run_node(name, node, state)
+
+    async def _fan_out(self, edges: List[Edge], state: NeuralState) -> Tuple[NeuralState, bool]:
+        """Bağımsız dalları TaskGroup ile eşzamanlı çalıştırıp sonuçları birleştirir.
+
+        Süre en yavaş dal kadardır; artifact'ler kenar sırasıyla last-write-wins.
+        Hata veren dal diğerlerini iptal etmez: hatası fork'unda kaydedilir ve
+        birleştirmeyle ``state.errors``'a geçer. Tüm dallar başarılıysa True döner.
+        """
+        base_budget = state.budget_used
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self._run_subgraph(e.target, state.fork())) for e in edges]
+        ok = True
+        for task in tasks:
+            child, child_ok = task.result()
+            ok = ok and child_ok
+            state.merge(child)
+            state.budget_used += child.budget_used - base_budget
+        return state, ok
+
     async def execute(self, state: NeuralState):
         current_name = self.start_node
-        print(f"🚀 Execution Started: {state.goal}")
+        logger.info("🚀 Execution Started: %s", state.goal, extra={"run_id": state.run_id})
+
+        # Döngü içinde attribute zinciri okumamak için bir kez bağla
+        time_fn = asyncio.get_running_loop().time
+        deadline = time_fn() + _MAX_EXECUTION_TIME
+        # Geri kenarlar (tester -> debugger -> tester) serbest; node başına ziyaret sınırlı.
+        max_visits = _MAX_NODE_VISITS
+        visits: Dict[str, int] = defaultdict(int)
 
         while current_name:
             node = self.nodes.get(current_name)
             if not node: break
 
-            print(f"⚙️  Running Node: {current_name}")
-            state = await node.run(state)
+            if time_fn() > deadline:
+                state.add_error("timeout", f"Graph execution exceeded {_MAX_EXECUTION_TIME}s")
+                break
+
+            visits[current_name] += 1
+            if visits[current_name] > max_visits:
+                state.add_error(
+                    "graph_cycle",
+                    f"Node '{current_name}' exceeded {max_visits} visits",
+                    {"node": current_name},
+                )
+                break
+
+            state.step += 1
+            # INFO kapalıyken node başına extra dict üretme
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "⚙️  Running Node: %s",
+                    current_name,
+                    extra={"run_id": state.run_id, "node": current_name, "step": state.step},
+                )
+            state, ok = await self._run_node(current_name, node, state)
+            if not ok:
+                break
 
-            current_name = self.edges.get(current_name)
+            edges = self._next_edges(current_name, state)
+            if len(edges) > 1:
+                # Fan-out: dallar paralel koşar, ardından ilk dalın ardılından (join) devam edilir
+                over = None
+                for edge in edges:
+                    visits[edge.target] += 1
+                    if over is None and visits[edge.target] > max_visits:
+                        over = edge.target
+                if over is not None:
+                    state.add_error(
+                        "graph_cycle",
+                        f"Node '{over}' exceeded {max_visits} visits",
+                        {"node": over},
+                    )
+                    break
+                state.step += 1
+                state, ok = await self._fan_out(edges, state)
+                if not ok:
+                    break
+                current_name = self._next_node(edges[0].target, state)
+            else:
+                current_name = edges[0].target if edges else None
 
-        print("✅ Execution Finished")
+        logger.info("✅ Execution Finished", extra={"run_id": state.run_id})
         return state
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from .state import NeuralState
 
 class BaseNode(ABC):
+    __slots__ = ("name",)
+
     def __init__(self, name: str):
         self.name = name
 
@@ -1,3 +1,4 @@
 class BaseNode:
+    __slots__ = ("name",)
     def __init__(self,name): self.name=name
     async def run(self,state): raise NotImplementedError
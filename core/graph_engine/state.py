@@ -1,29 +1,197 @@
-from dataclasses import dataclass, field
-from typing import Any, Dict, List
-from datetime import datetime
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Deque, Dict, List, Optional, Set
+from datetime import datetime, timezone
+import json
+import time
 import uuid
 
-@dataclass
+from core.config import settings
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# (saniye, iso string): aynı saniyedeki mesajlar formatlanmış zamanı paylaşır.
+_LAST_TS = [0, ""]
+
+
+def _iso_now() -> str:
+    """Saniye hassasiyetinde, saniyede bir kez formatlanan zaman damgası."""
+    now = int(time.time())
+    if now != _LAST_TS[0]:
+        _LAST_TS[:] = [now, datetime.fromtimestamp(now, timezone.utc).isoformat()]
+    return _LAST_TS[1]
+
+
+# compact() özetinde mesaj başına alıntı ve toplam özet gövdesi sınırı (karakter)
+_SUMMARY_EXCERPT = 200
+_SUMMARY_MAX_CHARS = 4000
+
+
+def _bounded() -> deque:
+    # Uzun swarm çalıştırmalarında bellek sınırlı kalsın: en eski kayıt O(1) düşer.
+    return deque(maxlen=settings.MAX_MESSAGES)
+
+
+@dataclass(slots=True)
+class Message:
+    """Konuşma turu. Dict yerine slots: tur başına daha az bellek ve GC yükü."""
+    role: str
+    content: str
+    name: str = ""
+    metadata: Optional[Dict[str, Any]] = None
+    timestamp: str = field(default_factory=_iso_now)
+
+    def to_wire(self) -> Dict[str, str]:
+        """Provider API'sine giden biçim (sadece role/content)."""
+        return {"role": self.role, "content": self.content}
+
+
+@dataclass(slots=True)
+class ErrorRecord:
+    """State'e kaydedilen hata (syntax hatası, policy ihlali vb.)."""
+    type: str
+    message: str
+    details: Optional[Dict[str, Any]] = None
+    timestamp: str = field(default_factory=_iso_now)
+
+
+@dataclass(slots=True)
+class StateDelta:
+    """Bir agent'ın state'e yazacakları; paylaşılan state'e join noktasında uygulanır."""
+    artifacts_set: Dict[str, Any] = field(default_factory=dict)
+    artifacts_del: Set[str] = field(default_factory=set)
+    messages: Deque[Message] = field(default_factory=_bounded)
+    errors: Deque[ErrorRecord] = field(default_factory=_bounded)
+
+
+@dataclass(slots=True)
 class NeuralState:
     """Global state passed between nodes in the graph engine."""
     run_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     goal: str = ""
     artifacts: Dict[str, Any] = field(default_factory=dict)
-    messages: List[Dict[str, Any]] = field(default_factory=list)
-    errors: List[Dict[str, Any]] = field(default_factory=list)
+    artifacts_meta: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    messages: Deque[Message] = field(default_factory=_bounded)
+    errors: Deque[ErrorRecord] = field(default_factory=_bounded)
     budget: float = 100.0
+    budget_used: float = 0.0
+    step: int = 0
     mode: str = "t0"
+    # Yalnızca fork'larda dolu: fork'tan beri eklenen mesaj/hatalar. Birleştirme
+    # deque indeksine değil buna bakar (maxlen taşınca indeksler kayar).
+    delta: Optional[StateDelta] = None
+
+    def add_message(
+        self, role: str, content: str, name: str = "", metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        msg = Message(role, content, name, metadata)
+        self.messages.append(msg)
+        if self.delta is not None:
+            self.delta.messages.append(msg)
+
+    def compact(self, keep: int) -> bool:
+        """Son ``keep`` mesaj dışındakileri tek bir özet mesajına katlar.
+
+        LLM çağrısı yapılmaz; özet şablonla üretilir. Katlanan mesajların hepsi
+        sondan başa listelenir; gövde ``_SUMMARY_MAX_CHARS``'ı aşınca en eskiler
+        listelenmez ve başlıkta kaç tanesinin atlandığı yazılır.
+        Katlama yapıldıysa True döner.
+        """
+        folded = len(self.messages) - keep
+        if keep <= 0 or folded <= 1:
+            return False
+        older = [self.messages.popleft() for _ in range(folded)]
+        lines: List[str] = []
+        size = 0
+        for m in reversed(older):
+            line = f"- [{m.name or m.role}] {m.content[:_SUMMARY_EXCERPT]}"
+            if size + len(line) + 1 > _SUMMARY_MAX_CHARS:
+                break
+            lines.append(line)
+            size += len(line) + 1
+        lines.reverse()
+        omitted = folded - len(lines)
+        header = f"Summary of {folded} earlier messages ({len(lines)} listed"
+        if omitted:
+            header += f", {omitted} oldest omitted to stay under {_SUMMARY_MAX_CHARS} chars"
+        summary = header + "):\n" + "\n".join(lines)
+        self.messages.appendleft(Message("system", summary, "summary"))
+        return True
 
-    def add_message(self, role: str, content: str):
-        self.messages.append({
-            "role": role, "content": content, 
-            "timestamp": datetime.now().isoformat()
-        })
+    def add_error(
+        self, error_type: str, message: str, details: Optional[Dict[str, Any]] = None
+    ) -> None:
+        err = ErrorRecord(error_type, message, details)
+        self.errors.append(err)
+        if self.delta is not None:
+            self.delta.errors.append(err)
+
+    def add_artifact(
+        self,
+        name: str,
+        value: Any,
+        artifact_type: str = "generic",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.artifacts[name] = value
+        self.artifacts_meta[name] = {"type": artifact_type, **(metadata or {})}
+
+    def update_budget(self, cost: float) -> None:
+        self.budget_used += cost
+
+    def fork(self) -> "NeuralState":
+        """Paralel dallar için bağımsız kopya (container'lar kopyalanır)."""
+        return replace(
+            self,
+            artifacts=dict(self.artifacts),
+            artifacts_meta=dict(self.artifacts_meta),
+            messages=deque(self.messages, maxlen=settings.MAX_MESSAGES),
+            errors=deque(self.errors, maxlen=settings.MAX_MESSAGES),
+            delta=StateDelta(),
+        )
+
+    def merge(self, other: "NeuralState") -> None:
+        """Fork'tan dönen state'i birleştirir: artifact'ler last-write-wins, fork'un
+        eklediği mesaj/hatalar (``other.delta``) sona eklenir."""
+        self.artifacts.update(other.artifacts)
+        self.artifacts_meta.update(other.artifacts_meta)
+        if other.delta is not None:
+            self._extend(other.delta.messages, other.delta.errors)
+
+    def apply(self, delta: StateDelta) -> None:
+        """Delta'yı tek adımda uygular (await yok, araya başka task giremez)."""
+        self.artifacts.update(delta.artifacts_set)
+        for key in delta.artifacts_del:
+            self.artifacts.pop(key, None)
+            self.artifacts_meta.pop(key, None)
+        self._extend(delta.messages, delta.errors)
+
+    def _extend(self, messages: Deque[Message], errors: Deque[ErrorRecord]) -> None:
+        # İç içe fork'larda da kayıt tutulsun diye kendi delta'sına da yazar.
+        self.messages.extend(messages)
+        self.errors.extend(errors)
+        if self.delta is not None:
+            self.delta.messages.extend(messages)
+            self.delta.errors.extend(errors)
 
     def to_dict(self):
         return {
             "run_id": self.run_id,
             "goal": self.goal,
+            "step": self.step,
+            "budget_used": self.budget_used,
             "messages": len(self.messages),
+            "errors": [asdict(e) for e in self.errors],
             "artifacts": list(self.artifacts.keys())
         }
+
+    def to_json(self) -> bytes:
+        """``to_dict()``'in JSON hali; orjson kuruluysa onunla (C, SIMD escape)."""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_NON_STR_KEYS, default=str)
+        return json.dumps(self.to_dict(), default=str).encode("utf-8")
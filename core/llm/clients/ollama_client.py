@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
-import httpx
+from core.llm.http import get_client
 
 
 class OllamaClient:
@@ -16,7 +16,6 @@ class OllamaClient:
             "prompt": prompt,
             "stream": False,
         }
-        async with httpx.AsyncClient(timeout=60) as client:
-            resp = await client.post(f"{self.base_url}/api/generate", json=payload)
-            resp.raise_for_status()
-            return resp.json()
+        resp = await get_client().post(f"{self.base_url}/api/generate", json=payload, timeout=60)
+        resp.raise_for_status()
+        return resp.json()
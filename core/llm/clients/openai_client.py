@@ -3,9 +3,8 @@ from __future__ import annotations
 import os
 from typing import Any, Dict
 
-import httpx
-
 from core.config import settings
+from core.llm.http import get_client
 
 
 class OpenAIClient:
@@ -27,11 +26,11 @@ class OpenAIClient:
             "max_tokens": settings.MAX_TOKENS,
         }
 
-        async with httpx.AsyncClient(timeout=60) as client:
-            resp = await client.post(
-                self.base_url,
-                json=payload,
-                headers={"Authorization": f"Bearer {self.api_key}"},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await get_client(http2=True).post(
+            self.base_url,
+            json=payload,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=60,
+        )
+        resp.raise_for_status()
+        return resp.json()
@@ -0,0 +1,50 @@
+"""
+Paylaşılan httpx.AsyncClient havuzu.
+
+Bağlantı havuzu (TCP/TLS) event loop'a bağlı olduğu için loop başına tek
+client tutulur; LLMRouter ve provider client'ları aynı havuzu kullanır.
+Bulut API'leri için ayrı bir HTTP/2 client'ı vardır (h2 kuruluysa): eşzamanlı
+istekler tek TLS bağlantısında multiplex edilir. Ollama (localhost) HTTP/1.1'de kalır.
+"""
+import asyncio
+import weakref
+from typing import Dict, Tuple
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+_HTTP2_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _client_options(http2: bool) -> Tuple[bool, httpx.Limits]:
+    if http2 and HTTP2_AVAILABLE:
+        return True, _HTTP2_LIMITS
+    return False, _LIMITS
+
+
+def get_client(http2: bool = False) -> httpx.AsyncClient:
+    """Çalışan loop'un client'ı. ``http2=True`` uzak (bulut) API'ler içindir."""
+    use_http2, limits = _client_options(http2)
+    clients = _CLIENTS.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(use_http2)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=60.0, limits=limits, http2=use_http2)
+        clients[use_http2] = client
+    return client
+
+
+async def aclose_client() -> None:
+    """Çalışan loop'un client'larını kapatır; loop kapanmadan önce çağrılmalı."""
+    clients = _CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
@@ -1,45 +1,144 @@
 # core/llm/router.py
+import asyncio
+import contextlib
+import functools
+import hashlib
 import time
+import weakref
 import httpx
 import json
-from typing import List, Dict, Any
+import re
+from typing import List, Dict, Any, AsyncIterator, Optional
 from core.config import settings
 from core.utils.logger import get_logger
+from core.llm.http import aclose_client, get_client
 from core.llm.models import LLMResponse
 from core.graph_engine.state import NeuralState
 
 logger = get_logger("LLMRouter")
 
+try:
+    from aiolimiter import AsyncLimiter
+
+    AIOLIMITER_AVAILABLE = True
+except ImportError:
+    AIOLIMITER_AVAILABLE = False
+
+try:
+    import diskcache
+
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+
+# E-posta, telefon, SSN, IBAN. Tek derlenmiş alternation; mesaj başına tek tarama.
+# Telefon için ayraç veya "+" öneki şart: çıplak 10 haneli sayılar (sipariş no,
+# timestamp, test verisi) PII sayılıp yerel modele zorlanmasın.
+_PII_RE = re.compile(
+    r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"
+    r"|(?<![\w+])\+\d{1,3}[-. ]?\(?\d{3}\)?[-. ]?\d{3}[-. ]?\d{4}\b"
+    r"|\(\d{3}\) ?\d{3}[-. ]\d{4}\b"
+    r"|\b\d{3}([-. ])\d{3}\1\d{4}\b"
+    r"|\b\d{3}-\d{2}-\d{4}\b"
+    r"|\b[A-Z]{2}\d{2}(?:\s?[A-Z0-9]{4}){2,7}(?:\s?[A-Z0-9]{1,4})?\b"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _disk_cache() -> Optional["diskcache.Cache"]:
+    if not (DISKCACHE_AVAILABLE and settings.LLM_CACHE_ENABLED):
+        return None
+    return diskcache.Cache(settings.LLM_CACHE_DIR)
+
+
+def _disk_cache_key(model: str, msgs: List[Dict]) -> str:
+    payload = json.dumps({"m": model, "msgs": msgs}, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
 
 class LLMRouter:
-    async def route(self, state: NeuralState, messages: List[Dict] = None) -> LLMResponse:
+    def __init__(self) -> None:
+        # Semaphore'lar da loop'a bağlı; provider başına eşzamanlılık sınırı.
+        self._limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _client(self, http2: bool = False) -> httpx.AsyncClient:
+        # Event loop başına paylaşılan AsyncClient (core.llm.http): TLS bağlantıları yeniden kullanılır.
+        return get_client(http2)
+
+    def _provider_limits(self) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        limits = self._limits.get(loop)
+        if limits is None:
+            limits = {
+                "ollama": asyncio.Semaphore(settings.OLLAMA_NUM_PARALLEL),
+                "openai": asyncio.Semaphore(settings.OPENAI_NUM_PARALLEL),
+            }
+            if AIOLIMITER_AVAILABLE and settings.OPENAI_RPM_LIMIT > 0:
+                limits["openai_rpm"] = AsyncLimiter(settings.OPENAI_RPM_LIMIT, 60)
+            self._limits[loop] = limits
+        return limits
+
+    @contextlib.asynccontextmanager
+    async def _slot(self, provider: str) -> AsyncIterator[None]:
+        """Provider'a giden istekleri sınırlar; gather ile gelen yük 429/timeout fırtınasına dönmez."""
+        limits = self._provider_limits()
+        rpm = limits.get(f"{provider}_rpm")
+        if rpm is not None:
+            await rpm.acquire()
+        async with limits[provider]:
+            yield
+
+    async def aclose(self) -> None:
+        await aclose_client()
+
+    async def route(
+        self, state: NeuralState, messages: List[Dict] = None, timeout: Optional[float] = None
+    ) -> LLMResponse:
         start_time = time.time()
         # Mesajları al (parametre olarak gelmediyse state'ten al)
-        msgs = messages or state.messages
+        msgs = messages or [m.to_wire() for m in state.messages]
 
         # Basit PII Kontrolü (Email veya Telefon varsa yerel model)
         # Gerçek hayatta burası daha gelişmiş bir regex veya model olmalı
-        contains_pii = "@" in str(msgs)
+        contains_pii = self._contains_pii(msgs)
+        local = contains_pii or not settings.OPENAI_API_KEY
+
+        # Aynı model + mesajlar daha önce yanıtlandıysa diskten dön.
+        # PII içeren konuşmalar diske yazılmaz.
+        cache = None if contains_pii else _disk_cache()
+        cache_key = None
+        provider = "ollama" if local else "openai"
+        if cache is not None:
+            model = settings.DEFAULT_LOCAL_MODEL if local else settings.DEFAULT_CLOUD_MODEL
+            cache_key = _disk_cache_key(model, msgs)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                response = LLMResponse.model_validate(cached)
+                response.latency = time.time() - start_time
+                return response
 
         try:
             # 1. Senaryo: PII var veya OpenAI Key yok -> YEREL (Ollama)
-            if contains_pii or not settings.OPENAI_API_KEY:
+            if local:
                 if contains_pii:
                     logger.info("🔒 PII Detected. Routing to LOCAL (Ollama)...")
                 else:
                     logger.warning("⚠️ No OpenAI Key found. Routing to LOCAL (Ollama)...")
-                response = await self._call_ollama(msgs)
+                response = await self._call_ollama(msgs, timeout)
 
             # 2. Senaryo: Güvenli -> BULUT (OpenAI)
             else:
                 logger.info("☁️ Routing to CLOUD (OpenAI)...")
-                response = await self._call_openai(msgs)
+                response = await self._call_openai(msgs, timeout)
 
         except Exception as e:
             # Hata durumunda (Örn: İnternet yok veya API hatası) -> Fallback
             logger.error(f"❌ Primary Model Failed: {e}. Trying Fallback to LOCAL...")
             try:
-                response = await self._call_ollama(msgs)
+                response = await self._call_ollama(msgs, timeout)
             except Exception as e2:
                 # İkisi de çalışmazsa hata dön
                 response = LLMResponse(
@@ -50,59 +149,90 @@ class LLMRouter:
                 )
 
         response.latency = time.time() - start_time
+        # Yalnızca istenen provider yanıtladıysa yaz; fallback yanıtı cloud anahtarına düşmesin.
+        if cache_key is not None and response.provider == provider:
+            cache.set(cache_key, response.model_dump(), expire=settings.LLM_CACHE_TTL)
         return response
 
-    async def _call_openai(self, messages: List[Dict]) -> LLMResponse:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            payload = {
-                "model": settings.DEFAULT_CLOUD_MODEL,
-                "messages": messages,
-                "temperature": 0.7
-            }
-            # OpenAI API Çağrısı
-            resp = await client.post(
+    async def route_batch(
+        self,
+        states: List[NeuralState],
+        messages_list: List[List[Dict]],
+        timeout: Optional[float] = None,
+    ) -> List[LLMResponse]:
+        """Birden çok prompt'u eşzamanlı yönlendirir; yanıt sırası girdi sırasıyla aynıdır."""
+        return list(await asyncio.gather(
+            *(self.route(state, messages=msgs, timeout=timeout) for state, msgs in zip(states, messages_list))
+        ))
+
+    def _contains_pii(self, msgs: List[Dict]) -> bool:
+        # Tüm listeyi str()'e çevirmek yerine mesaj mesaj bak; ilk eşleşmede dur.
+        for m in msgs:
+            content = m.get("content", "")
+            if _PII_RE.search(content if isinstance(content, str) else str(content)):
+                return True
+        return False
+
+    async def _call_openai(self, messages: List[Dict], timeout: Optional[float] = None) -> LLMResponse:
+        payload = {
+            "model": settings.DEFAULT_CLOUD_MODEL,
+            "messages": messages,
+            "temperature": 0.7
+        }
+        # OpenAI API Çağrısı
+        async with self._slot("openai"):
+            resp = await self._client(http2=True).post(
                 "https://api.openai.com/v1/chat/completions",
                 headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
-                json=payload
+                json=payload,
+                timeout=timeout or 60.0,
             )
-            resp.raise_for_status()
-            data = resp.json()
+        resp.raise_for_status()
+        data = resp.json()
 
-            return LLMResponse(
-                content=data["choices"][0]["message"]["content"],
-                model=data["model"],
-                provider="openai",
-                usage=data.get("usage", {})
-            )
+        return LLMResponse(
+            content=data["choices"][0]["message"]["content"],
+            model=data["model"],
+            provider="openai",
+            usage=data.get("usage", {})
+        )
 
-    async def _call_ollama(self, messages: List[Dict]) -> LLMResponse:
+    async def _call_ollama(self, messages: List[Dict], timeout: Optional[float] = None) -> LLMResponse:
         # Ollama genellikle localhost:11434 üzerinde çalışır
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            payload = {
-                "model": settings.DEFAULT_LOCAL_MODEL,
-                "messages": messages,
-                "stream": False
-            }
-            try:
-                # Ollama Chat Endpoint
-                resp = await client.post(f"{settings.OLLAMA_BASE_URL}/chat", json=payload)
-
-                if resp.status_code == 200:
-                    data = resp.json()
-                    return LLMResponse(
-                        content=data["message"]["content"],
-                        model=data["model"],
-                        provider="ollama",
-                        usage={"total_tokens": data.get("eval_count", 0)}
-                    )
-                else:
-                    raise Exception(f"Ollama Status: {resp.status_code}")
+        payload = {
+            "model": settings.DEFAULT_LOCAL_MODEL,
+            "messages": messages,
+            "stream": False
+        }
+        try:
+            # Ollama Chat Endpoint
+            async with self._slot("ollama"):
+                resp = await self._client().post(
+                    f"{settings.OLLAMA_BASE_URL}/chat", json=payload, timeout=timeout or 120.0
+                )
 
-            except httpx.ConnectError:
-                # Eğer Ollama çalışmıyorsa sistemi kilitlememek için Mock cevap dön
-                logger.critical("Ollama is NOT running locally!")
+            if resp.status_code == 200:
+                data = resp.json()
                 return LLMResponse(
-                    content="[SYSTEM ERROR] Ollama (Local LLM) is not running. Please start it or set OPENAI_API_KEY.",
-                    model="error",
-                    provider="local_error"
-                )
\ No newline at end of file
+                    content=data["message"]["content"],
+                    model=data["model"],
+                    provider="ollama",
+                    usage={"total_tokens": data.get("eval_count", 0)}
+                )
+            else:
+                raise Exception(f"Ollama Status: {resp.status_code}")
+
+        except httpx.ConnectError:
+            # Eğer Ollama çalışmıyorsa sistemi kilitlememek için Mock cevap dön
+            logger.critical("Ollama is NOT running locally!")
+            return LLMResponse(
+                content="[SYSTEM ERROR] Ollama (Local LLM) is not running. Please start it or set OPENAI_API_KEY.",
+                model="error",
+                provider="local_error"
+            )
+
+
+@functools.lru_cache(maxsize=1)
+def get_router() -> LLMRouter:
+    """Tüm agent'ların paylaştığı router (ve dolayısıyla HTTP bağlantı havuzu)."""
+    return LLMRouter()
\ No newline at end of file
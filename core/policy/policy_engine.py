@@ -1,10 +1,18 @@
 # core/policy/policy_engine.py
 from __future__ import annotations
+import asyncio
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from core.utils.logger import get_logger
 
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = get_logger("PolicyEngine")
 
 
@@ -23,68 +31,126 @@ class PolicyViolation:
     details: Optional[Dict] = None
 
 
-class PolicyEngine:
-    """
-    LLM çıktılarını ve üretilen kodu denetleyen gelişmiş güvenlik motoru.
-    Import hilelerini ve tehlikeli parametreleri yakalar.
-    """
+# 1. Yasaklı Kelimeler (LLM Sohbet Çıktısı için)
+BANNED_OUTPUT_KEYWORDS = (
+    "drop database", "rm -rf", "format c:", "key=",
+    "delete all files", "wipe disk"
+)
 
-    def __init__(self) -> None:
-        # 1. Yasaklı Kelimeler (LLM Sohbet Çıktısı için)
-        self.banned_output_keywords = [
-            "drop database", "rm -rf", "format c:", "key=",
-            "delete all files", "wipe disk"
-        ]
+# 2. Yasaklı Kod Desenleri (Statik Analiz)
+BANNED_CODE_PATTERNS = (
+    # Shell Execution & Dangerous Flags
+    "os.system", "shell=True", "subprocess",
+
+    # Dynamic Execution
+    "eval(", "exec(", "compile(", "__import__",
+
+    # File System Destruction (Fonksiyonlar)
+    "os.remove", "os.unlink", "os.rmdir", "shutil.rmtree",
+
+    # File System Destruction (String Komutlar)
+    "rm -rf", "del /f",
+
+    # Network
+    "socket.socket", "telnetlib",
+
+    # System Info
+    "platform.system", "getpass.getuser"
+)
 
-        # 2. Yasaklı Kod Desenleri (Statik Analiz)
-        self.banned_code_patterns = [
-            # Shell Execution & Dangerous Flags
-            "os.system", "shell=True", "subprocess",
 
-            # Dynamic Execution
-            "eval(", "exec(", "compile(", "__import__",
+def _build_automaton(patterns: Tuple[str, ...]):
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for idx, pattern in enumerate(patterns):
+        automaton.add_word(pattern, (idx, pattern))
+    automaton.make_automaton()
+    return automaton
 
-            # File System Destruction (Fonksiyonlar)
-            "os.remove", "os.unlink", "os.rmdir", "shutil.rmtree",
 
-            # File System Destruction (String Komutlar)
-            "rm -rf", "del /f",
+# Desen tabloları sabit: otomatlar process başına bir kez kurulur, tüm engine'ler paylaşır
+_OUTPUT_AC = _build_automaton(BANNED_OUTPUT_KEYWORDS)
+_CODE_AC = _build_automaton(BANNED_CODE_PATTERNS)
 
-            # Network
-            "socket.socket", "telnetlib",
 
-            # System Info
-            "platform.system", "getpass.getuser"
-        ]
+class PolicyEngine:
+    """
+    LLM çıktılarını ve üretilen kodu denetleyen gelişmiş güvenlik motoru.
+    Import hilelerini ve tehlikeli parametreleri yakalar.
+    """
+
+    def __init__(self) -> None:
+        self.banned_output_keywords = BANNED_OUTPUT_KEYWORDS
+        self.banned_code_patterns = BANNED_CODE_PATTERNS
+        self._output_ac = _OUTPUT_AC
+        self._code_ac = _CODE_AC
+
+    @staticmethod
+    def _scan(text: str, patterns: Tuple[str, ...], automaton, first_only: bool = False) -> Iterable[str]:
+        """Metinde geçen desenleri liste sırasıyla ve tekil olarak döndürür.
+
+        ``first_only=True`` ilk eşleşmede durur (fail-fast denetim).
+        """
+        if automaton is None:
+            # pyahocorasick yoksa desen başına substring taraması
+            if first_only:
+                return next(([p] for p in patterns if p in text), [])
+            return [p for p in patterns if p in text]
+        if first_only:
+            return next(([pattern] for _, (_, pattern) in automaton.iter(text)), [])
+        hits = {idx: pattern for _, (idx, pattern) in automaton.iter(text)}
+        return [hits[idx] for idx in sorted(hits)]
 
     def check_llm_output(self, text: str, context: Dict) -> List[PolicyViolation]:
         violations: List[PolicyViolation] = []
         lower = text.lower()
-        for kw in self.banned_output_keywords:
-            if kw in lower:
-                violations.append(PolicyViolation(
-                    code="banned_keyword",
-                    message=f"Output contains banned phrase: {kw}",
-                    severity=PolicySeverity.HIGH,
-                    details={"keyword": kw}
-                ))
+        for kw in self._scan(lower, self.banned_output_keywords, self._output_ac):
+            violations.append(PolicyViolation(
+                code="banned_keyword",
+                message=f"Output contains banned phrase: {kw}",
+                severity=PolicySeverity.HIGH,
+                details={"keyword": kw}
+            ))
         return violations
 
-    def check_code(self, code: str, context: Dict) -> List[PolicyViolation]:
+    def check_code(self, code: str, context: Dict, early_exit: bool = False) -> List[PolicyViolation]:
+        """Kodu yasaklı desenlere karşı tarar.
+
+        Tüm kod desenleri CRITICAL olduğundan ``early_exit=True`` ilk ihlalde döner;
+        yalnızca "geçer/geçmez" kararı veren çağıranlar için.
+        """
         violations: List[PolicyViolation] = []
 
-        # Basit string eşleştirme
-        for pattern in self.banned_code_patterns:
-            if pattern in code:
-                # Import hileleri için bağlam kontrolü yapılabilir ama
-                # Enterprise güvenlikte "güvenli tarafta kalmak" (fail-safe) esastır.
-                violations.append(PolicyViolation(
-                    code="dangerous_code_pattern",
-                    message=f"Security Alert: Code contains dangerous pattern: '{pattern}'",
-                    severity=PolicySeverity.CRITICAL,
-                    details={"pattern": pattern}
-                ))
+        # Çoklu desen eşleştirme (Aho-Corasick, tek geçiş)
+        for pattern in self._scan(code, self.banned_code_patterns, self._code_ac, early_exit):
+            # Import hileleri için bağlam kontrolü yapılabilir ama
+            # Enterprise güvenlikte "güvenli tarafta kalmak" (fail-safe) esastır.
+            violations.append(PolicyViolation(
+                code="dangerous_code_pattern",
+                message=f"Security Alert: Code contains dangerous pattern: '{pattern}'",
+                severity=PolicySeverity.CRITICAL,
+                details={"pattern": pattern}
+            ))
 
         if violations:
             logger.warning(f"🚨 Code policy violations found: {len(violations)}")
-        return violations
\ No newline at end of file
+        return violations
+
+    def _check_code_batch_sync(
+        self, codes: List[str], context: Dict, early_exit: bool = False
+    ) -> List[PolicyViolation]:
+        violations: List[PolicyViolation] = []
+        for code in codes:
+            violations.extend(self.check_code(code, context, early_exit))
+            if early_exit and violations:
+                break
+        return violations
+
+    async def check_code_batch(
+        self, codes: List[str], context: Dict, early_exit: bool = False
+    ) -> List[PolicyViolation]:
+        """Birden çok kod girdisini tek çağrıda, event loop dışında (worker thread) tarar."""
+        if not codes:
+            return []
+        return await asyncio.to_thread(self._check_code_batch_sync, codes, context, early_exit)
\ No newline at end of file
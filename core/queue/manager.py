@@ -3,16 +3,23 @@ Background task queue manager for async pipeline execution.
 """
 import asyncio
 import uuid
+from collections import defaultdict
+from itertools import islice
 from typing import Dict, Any, Optional, Callable
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 import threading
+import time
 import queue as py_queue
 from concurrent.futures import ThreadPoolExecutor
 
 from core.telemetry.metrics import metrics
 from observability.session_replay import session_replay, EventType
+from core.llm.http import aclose_client
+from core.utils.logger import get_logger
+
+logger = get_logger("TaskQueue")
 
 
 class TaskStatus(Enum):
@@ -23,14 +30,14 @@ class TaskStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Background task representation."""
     task_id: str
     goal: str
     pipeline_type: str = "t1"
     status: TaskStatus = TaskStatus.PENDING
-    created_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     result: Optional[Dict[str, Any]] = None
@@ -44,14 +51,30 @@ class TaskQueueManager:
     Manages background execution of pipeline tasks.
     """
 
-    def __init__(self, max_workers: int = 3):
+    # Bitmiş task'ler için tutulan en fazla kayıt (bellek sınırı)
+    _TERMINAL = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+    def __init__(self, max_workers: int = 3, max_history: int = 1000):
         self.max_workers = max_workers
+        self.max_history = max_history
+        # Ekleme sırası = oluşturulma sırası; listeleme sıralama gerektirmez
         self.tasks: Dict[str, Task] = {}
-        self.task_queue = py_queue.Queue()
+        # Tek üretici/tüketici FIFO; join/task_done gerekmiyor -> C'de kilitsiz SimpleQueue
+        self.task_queue = py_queue.SimpleQueue()
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self._lock = threading.RLock()
         self._running = False
         self._worker_thread = None
+        # Durum sayaçları geçişlerde güncellenir; get_stats O(1)
+        self._status_counts: Dict[TaskStatus, int] = defaultdict(int)
+        # Worker thread başına kalıcı event loop (task başına kurulum/yıkım yok)
+        self._loops = threading.local()
+
+    def _set_status(self, task: Task, status: TaskStatus) -> None:
+        """Task durumunu değiştirir ve sayaçları günceller (``_lock`` altında çağrılmalı)."""
+        self._status_counts[task.status] -= 1
+        self._status_counts[status] += 1
+        task.status = status
 
     def start(self):
         """Start the task queue worker."""
@@ -69,8 +92,51 @@ class TaskQueueManager:
         self._running = False
         if self._worker_thread:
             self._worker_thread.join(timeout=5.0)
+        self._close_loops()
         self.executor.shutdown(wait=True)
 
+    def _thread_loop(self) -> asyncio.AbstractEventLoop:
+        """Çağıran worker thread'in loop'u; ilk task'te oluşturulur."""
+        loop = getattr(self._loops, "loop", None)
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            self._loops.loop = loop
+        asyncio.set_event_loop(loop)
+        return loop
+
+    def _close_loops(self) -> None:
+        """Her worker thread'in loop'unu ve HTTP client'larını o thread üzerinde kapatır.
+
+        ``stop()`` çalışan bir loop içinden (FastAPI lifespan) çağrılabilir; bu yüzden
+        loop'lar burada çalıştırılmaz. Barrier, ``max_workers`` kapanış işinin her
+        birinin ayrı bir executor thread'ine düşmesini sağlar.
+        """
+        barrier = threading.Barrier(self.max_workers)
+        futures = [
+            self.executor.submit(self._close_thread_loop, barrier)
+            for _ in range(self.max_workers)
+        ]
+        for future in futures:
+            try:
+                future.result(timeout=10.0)
+            except Exception as e:
+                logger.warning("Worker loop close failed: %s", e)
+
+    def _close_thread_loop(self, barrier: threading.Barrier) -> None:
+        try:
+            barrier.wait(timeout=5.0)
+        except threading.BrokenBarrierError:
+            pass
+        loop = getattr(self._loops, "loop", None)
+        self._loops.loop = None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.run_until_complete(aclose_client())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
     def _worker_loop(self):
         """Background worker loop."""
         while self._running:
@@ -87,7 +153,7 @@ class TaskQueueManager:
             except py_queue.Empty:
                 continue
             except Exception as e:
-                print(f"Task worker error: {e}")
+                logger.exception("Task worker error: %s", e)
                 continue
 
     def _process_task(self, task_id: str):
@@ -98,8 +164,10 @@ class TaskQueueManager:
                 return
 
             # Update task status
-            task.status = TaskStatus.RUNNING
-            task.started_at = datetime.now()
+            self._set_status(task, TaskStatus.RUNNING)
+            task.started_at = datetime.now(timezone.utc)
+            # Süre ölçümü monotonic saatle; datetime yalnızca görünen zaman damgaları için
+            mono_start = time.monotonic()
 
         try:
             # Import here to avoid circular imports
@@ -139,12 +207,10 @@ class TaskQueueManager:
             # Note: We need to adapt if pipeline.run is async
             import asyncio
 
-            # Create event loop for this thread
+            # Thread'in kalıcı loop'unu kullan; HTTP bağlantıları task'ler arasında korunur
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                loop = self._thread_loop()
                 state = loop.run_until_complete(pipeline.run(task.goal))
-                loop.close()
             except RuntimeError:
                 # If there's already a running loop (e.g., in main thread)
                 state = asyncio.run(pipeline.run(task.goal))
@@ -155,21 +221,22 @@ class TaskQueueManager:
                 event_type=EventType.AGENT_COMPLETE,
                 agent_name="Pipeline",
                 data={"state": state.to_dict() if hasattr(state, 'to_dict') else str(state)},
-                duration_ms=(datetime.now() - task.started_at).total_seconds() * 1000
+                duration_ms=(time.monotonic() - mono_start) * 1000
             )
 
             session_replay.end_session(session_id, "completed")
 
             # Update task with result
             with self._lock:
-                task.status = TaskStatus.COMPLETED
-                task.completed_at = datetime.now()
+                self._set_status(task, TaskStatus.COMPLETED)
+                task.completed_at = datetime.now(timezone.utc)
+                duration = time.monotonic() - mono_start
                 task.result = {
                     "state": state.to_dict() if hasattr(state, 'to_dict') else str(state),
                     "session_id": session_id,
                     "artifacts": getattr(state, 'artifacts', {}),
                     "metrics": {
-                        "duration_seconds": (task.completed_at - task.started_at).total_seconds(),
+                        "duration_seconds": duration,
                         "status": "success"
                     }
                 }
@@ -177,13 +244,13 @@ class TaskQueueManager:
             # Update metrics
             metrics.record_pipeline_run(
                 pipeline_type=task.pipeline_type,
-                duration=(task.completed_at - task.started_at).total_seconds(),
+                duration=duration,
                 status="completed"
             )
 
         except Exception as e:
             error_msg = str(e)
-            print(f"Task {task_id} failed: {error_msg}")
+            logger.exception("Task %s failed: %s", task_id, error_msg)
 
             # Record error
             if task.session_id:
@@ -197,14 +264,14 @@ class TaskQueueManager:
 
             # Update task with error
             with self._lock:
-                task.status = TaskStatus.FAILED
-                task.completed_at = datetime.now()
+                self._set_status(task, TaskStatus.FAILED)
+                task.completed_at = datetime.now(timezone.utc)
                 task.error = error_msg
 
             # Update metrics
             metrics.record_pipeline_run(
                 pipeline_type=task.pipeline_type,
-                duration=(datetime.now() - task.started_at).total_seconds(),
+                duration=time.monotonic() - mono_start,
                 status="failed"
             )
 
@@ -222,13 +289,29 @@ class TaskQueueManager:
 
         with self._lock:
             self.tasks[task_id] = task
-            self.task_queue.put(task_id)
+            self._status_counts[task.status] += 1
+            self._evict_history()
+
+        # Kuyruk kendi içinde thread-safe; manager kilidi dışında ekle
+        self.task_queue.put(task_id)
 
         # Update metrics
         metrics.update_queue_size("pipeline_tasks", self.task_queue.qsize())
 
         return task_id
 
+    def _evict_history(self) -> None:
+        """Sınır aşılınca en eski bitmiş task'leri düşürür (``_lock`` altında çağrılmalı)."""
+        excess = len(self.tasks) - self.max_history
+        if excess <= 0:
+            return
+        stale = list(islice(
+            (task_id for task_id, task in self.tasks.items() if task.status in self._TERMINAL),
+            excess,
+        ))
+        for task_id in stale:
+            self._status_counts[self.tasks.pop(task_id).status] -= 1
+
     def get_task(self, task_id: str) -> Optional[Task]:
         """Get task by ID."""
         with self._lock:
@@ -237,9 +320,7 @@ class TaskQueueManager:
     def list_tasks(self, limit: int = 50, offset: int = 0) -> list[Task]:
         """List tasks sorted by creation time."""
         with self._lock:
-            tasks = list(self.tasks.values())
-            tasks.sort(key=lambda t: t.created_at, reverse=True)
-            return tasks[offset:offset + limit]
+            return list(islice(reversed(self.tasks.values()), offset, offset + limit))
 
     def cancel_task(self, task_id: str) -> bool:
         """Cancel a pending task."""
@@ -248,8 +329,8 @@ class TaskQueueManager:
             if not task or task.status != TaskStatus.PENDING:
                 return False
 
-            task.status = TaskStatus.CANCELLED
-            task.completed_at = datetime.now()
+            self._set_status(task, TaskStatus.CANCELLED)
+            task.completed_at = datetime.now(timezone.utc)
 
             # Note: We can't remove from queue easily, but we can mark it as cancelled
             # The worker will skip it when it sees cancelled status
@@ -259,18 +340,13 @@ class TaskQueueManager:
     def get_stats(self) -> Dict[str, Any]:
         """Get queue statistics."""
         with self._lock:
-            total = len(self.tasks)
-            pending = sum(1 for t in self.tasks.values() if t.status == TaskStatus.PENDING)
-            running = sum(1 for t in self.tasks.values() if t.status == TaskStatus.RUNNING)
-            completed = sum(1 for t in self.tasks.values() if t.status == TaskStatus.COMPLETED)
-            failed = sum(1 for t in self.tasks.values() if t.status == TaskStatus.FAILED)
-
+            counts = self._status_counts
             return {
-                "total_tasks": total,
-                "pending": pending,
-                "running": running,
-                "completed": completed,
-                "failed": failed,
+                "total_tasks": len(self.tasks),
+                "pending": counts[TaskStatus.PENDING],
+                "running": counts[TaskStatus.RUNNING],
+                "completed": counts[TaskStatus.COMPLETED],
+                "failed": counts[TaskStatus.FAILED],
                 "queue_size": self.task_queue.qsize(),
                 "max_workers": self.max_workers
             }
@@ -32,10 +32,7 @@ class TaskWorker:
             self._worker_thread.join(timeout=5.0)
 
     def _run(self):
-        """Main worker loop."""
-        while not self._stop_event.is_set():
-            # Process tasks
-            self.task_queue.start()
-
-            # Sleep to prevent busy waiting
-            self._stop_event.wait(timeout=0.1)
\ No newline at end of file
+        """Start the queue once and block until shutdown (no polling)."""
+        self.task_queue.start()
+        self._stop_event.wait()
+        self.task_queue.stop()
\ No newline at end of file
@@ -2,7 +2,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 from uuid import uuid4
-from datetime import datetime
+from datetime import datetime, timezone
+import logging
 
 from core.self_healing.error_classifier import ErrorClassifier, ErrorType, ErrorAnalysis
 from core.self_healing.repair_strategies import RepairStrategyFactory
@@ -45,10 +46,11 @@ class SelfHealingEngine:
 
     def diagnose(self, error_log: str, code: Optional[str] = None) -> ErrorDiagnosis:
         analysis: ErrorAnalysis = self.classifier.classify(error_log)
-        logger.info(
-            "🔍 Diagnosed error",
-            extra={"type": analysis.type.value, "details": analysis.details},
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "🔍 Diagnosed error",
+                extra={"type": analysis.type.value, "details": analysis.details},
+            )
 
         fix_prompt = RepairStrategyFactory.get_strategy(
             error_type=analysis.type,
@@ -75,7 +77,7 @@ class SelfHealingEngine:
         session_id = str(uuid4())
         attempt = RepairAttempt(
             attempt_id=1,
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=datetime.now(timezone.utc).isoformat(),
             description=f"Generated fix prompt for error type {diagnosis.type.value}",
             success=False,
         )
@@ -89,14 +91,15 @@ class SelfHealingEngine:
             success=False,
         )
 
-        logger.info(
-            "🛠️ Healing session created",
-            extra={
-                "session_id": session_id,
-                "error_type": diagnosis.type.value,
-                "attempts": len(session.repair_attempts),
-            },
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "🛠️ Healing session created",
+                extra={
+                    "session_id": session_id,
+                    "error_type": diagnosis.type.value,
+                    "attempts": len(session.repair_attempts),
+                },
+            )
 
         return code, session
 
@@ -3,6 +3,13 @@ import re
 from enum import Enum
 from dataclasses import dataclass
 
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 
 class ErrorType(Enum):
     SYNTAX = "syntax"
@@ -19,6 +26,29 @@ class ErrorAnalysis:
     details: str
 
 
+def _compile_patterns(patterns):
+    """Tüm pattern'leri tek alternation'a derler; grup adı -> (öncelik, tip, pattern)."""
+    rules = {}
+    parts = []
+    for err_type, type_patterns in patterns.items():
+        for pattern in type_patterns:
+            name = f"p{len(rules)}"
+            rules[name] = (len(rules), err_type, pattern)
+            parts.append(f"(?P<{name}>{pattern})")
+    return rules, re.compile("|".join(parts), re.IGNORECASE)
+
+
+def _build_automaton(rules):
+    """Pattern'ler düz kelime: küçük harfe çevrilmiş log üzerinde Aho-Corasick (kuruluysa)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rule in rules.values():
+        automaton.add_word(rule[2].lower(), rule)
+    automaton.make_automaton()
+    return automaton
+
+
 class ErrorClassifier:
     PATTERNS = {
         ErrorType.SYNTAX: [r"SyntaxError", r"IndentationError", r"TabError"],
@@ -26,16 +56,30 @@ class ErrorClassifier:
         ErrorType.TIMEOUT: [r"TimeoutError", r"time limit exceeded"],
         ErrorType.LOGIC: [r"AssertionError", r"failed", r"mismatch"],
     }
+    _RULES, _COMBINED_RE = _compile_patterns(PATTERNS)
+    _AUTOMATON = _build_automaton(_RULES)
+
+    def _matches(self, error_log: str):
+        if self._AUTOMATON is not None:
+            return (rule for _, rule in self._AUTOMATON.iter(error_log.lower()))
+        return (self._RULES[m.lastgroup] for m in self._COMBINED_RE.finditer(error_log))
 
     def classify(self, error_log: str) -> ErrorAnalysis:
-        for err_type, patterns in self.PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, error_log, re.IGNORECASE):
-                    return ErrorAnalysis(
-                        type=err_type,
-                        message=error_log,
-                        details=f"Matched {pattern}",
-                    )
+        # Log üzerinde tek tarama; birden çok eşleşmede PATTERNS sırası (öncelik) korunur.
+        best = None
+        for rule in self._matches(error_log):
+            if best is None or rule[0] < best[0]:
+                best = rule
+                if rule[0] == 0:
+                    break
+
+        if best is not None:
+            _, err_type, pattern = best
+            return ErrorAnalysis(
+                type=err_type,
+                message=error_log,
+                details=f"Matched {pattern}",
+            )
 
         return ErrorAnalysis(
             type=ErrorType.UNKNOWN,
@@ -2,25 +2,21 @@ from __future__ import annotations
 
 from core.self_healing.error_classifier import ErrorType
 
+# Hata tipine göre görev satırı; if/elif zinciri yerine tek dict lookup
+_TASK_SUFFIX = {
+    ErrorType.SYNTAX: "TASK: Fix the syntax error. Check indentation, colons, and brackets.",
+    ErrorType.IMPORT: "TASK: Fix the import error. Ensure standard libraries are used or mock external deps.",
+    ErrorType.LOGIC: "TASK: Fix the logic error. The output did not match the expectation.",
+    ErrorType.TIMEOUT: "TASK: Optimize the code or break it into smaller chunks to avoid timeouts.",
+}
+_TASK_DEFAULT = "TASK: Analyze the trace and fix the code in a safe and minimal way."
+
 
 class RepairStrategyFactory:
     @staticmethod
     def get_strategy(error_type: ErrorType, code: str, error: str) -> str:
-        base_instruction = (
-            "Here is the code:\n```\n"
-            + code
-            + "\n```\n\nHere is the error:\n"
-            + error
-            + "\n\n"
+        # Tek f-string: ara string üretilmez
+        return (
+            f"Here is the code:\n```\n{code}\n```\n\nHere is the error:\n{error}\n\n"
+            f"{_TASK_SUFFIX.get(error_type, _TASK_DEFAULT)}"
         )
-
-        if error_type == ErrorType.SYNTAX:
-            return base_instruction + "TASK: Fix the syntax error. Check indentation, colons, and brackets."
-        elif error_type == ErrorType.IMPORT:
-            return base_instruction + "TASK: Fix the import error. Ensure standard libraries are used or mock external deps."
-        elif error_type == ErrorType.LOGIC:
-            return base_instruction + "TASK: Fix the logic error. The output did not match the expectation."
-        elif error_type == ErrorType.TIMEOUT:
-            return base_instruction + "TASK: Optimize the code or break it into smaller chunks to avoid timeouts."
-        else:
-            return base_instruction + "TASK: Analyze the trace and fix the code in a safe and minimal way."
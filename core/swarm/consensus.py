@@ -6,6 +6,9 @@ from core.utils.logger import get_logger
 
 logger = get_logger("ConsensusEngine")
 
+# Olumlu sayılan oy etiketleri
+_POSITIVE_VOTES = frozenset({"approve", "pass", "success"})
+
 
 class ConsensusStrategy(Enum):
     MAJORITY_VOTE = "majority"
@@ -20,7 +23,8 @@ class ConsensusEngine:
             return False
 
         total = len(votes)
-        positive = votes.count("approve") + votes.count("pass") + votes.count("success")
+        # Tek geçiş (C seviyesinde map + set üyeliği)
+        positive = sum(map(_POSITIVE_VOTES.__contains__, votes))
 
         logger.info(
             "🗳️ Consensus Check",
@@ -1,15 +1,20 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+import sys
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Dict, Any
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 
+from core.config import settings
 
-@dataclass
+
+@dataclass(slots=True)
 class SwarmMessage:
     role: str
     content: str
     agent_name: str
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -17,15 +22,33 @@ class SwarmConversation:
     """Manages shared context and history of a swarm session."""
 
     def __init__(self) -> None:
-        self.history: List[SwarmMessage] = []
+        # Sınırlı geçmiş: en eski mesajlar otomatik düşer
+        self.history: Deque[SwarmMessage] = deque(maxlen=settings.MAX_MESSAGES)
+        # to_dict için mesaj eklenirken serileştirilmiş kopya (history ile aynı sınır)
+        self._serialized: Deque[Dict[str, Any]] = deque(maxlen=settings.MAX_MESSAGES)
 
     def add(self, role: str, content: str, agent_name: str, metadata: Dict[str, Any] | None = None) -> None:
-        msg = SwarmMessage(role=role, content=content, agent_name=agent_name, metadata=metadata or {})
+        # role/agent_name küçük bir kümeden gelir; intern ile tek kopya paylaşılır
+        msg = SwarmMessage(
+            role=sys.intern(role),
+            content=content,
+            agent_name=sys.intern(agent_name),
+            metadata=metadata or {},
+        )
         self.history.append(msg)
+        self._serialized.append({
+            "role": msg.role,
+            "content": msg.content,
+            "agent_name": msg.agent_name,
+            "timestamp": msg.timestamp,
+            "metadata": msg.metadata,
+        })
 
     def get_context_window(self, limit: int = 10) -> str:
-        recent = self.history[-limit:]
+        # Sondan yalnızca ``limit`` mesaj yürünür (deque'de O(limit))
+        recent = list(islice(reversed(self.history), max(limit, 0)))
+        recent.reverse()
         return "\n".join([f"[{m.agent_name}]: {m.content}" for m in recent])
 
     def to_dict(self) -> List[Dict[str, Any]]:
-        return [m.__dict__ for m in self.history]
+        return list(self._serialized)
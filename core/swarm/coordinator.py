@@ -1,4 +1,6 @@
 from __future__ import annotations
+import asyncio
+import re
 from dataclasses import dataclass
 from typing import List, Sequence
 
@@ -11,12 +13,24 @@ from core.utils.logger import get_logger
 
 logger = get_logger("SwarmCoordinator")
 
+# Mesajda geçerse ajanın oyu "success" sayılır
+_SUCCESS_KEYWORDS = ("tests passed", "syntax ok", "fixed", "success")
+# Tek derlenmiş alternation: kopya string üretmeden, tek geçişte, büyük/küçük harf duyarsız
+_SUCCESS_RE = re.compile("|".join(map(re.escape, _SUCCESS_KEYWORDS)), re.I)
+
+
+def _is_success(content: str) -> bool:
+    """Başarı anahtar kelimelerinden biri geçiyor mu."""
+    return _SUCCESS_RE.search(content) is not None
+
 
 @dataclass
 class SwarmConfig:
     agents: Sequence[BaseNode]
     strategy: ConsensusStrategy = ConsensusStrategy.MAJORITY_VOTE
     max_rounds: int = settings.MAX_SWARM_ROUNDS
+    # Ajanlar birbirinin çıktısına bağlı değilse (ör. paralel araştırma) tur içinde eşzamanlı koşar
+    parallel: bool = False
 
 
 class SwarmCoordinator:
@@ -39,24 +53,17 @@ class SwarmCoordinator:
             logger.info("Swarm round", extra={"run_id": state.run_id, "round": round_no})
             votes: List[str] = []
 
-            for agent in self.config.agents:
-                state = await agent.execute(state)
+            if self.config.parallel:
+                state = await self._run_parallel_round(state, round_no, votes)
+            else:
+                for agent in self.config.agents:
+                    state = await agent.execute(state)
+                    content = state.messages[-1].content if state.messages else ""
+                    self._record(agent, content, round_no, votes)
 
-                last_msg = state.messages[-1] if state.messages else {}
-                content = last_msg.get("content", "")
-
-                self.conversation.add(
-                    role="assistant",
-                    content=content,
-                    agent_name=agent.name,
-                    metadata={"round": round_no},
-                )
-
-                lower = content.lower()
-                if any(k in lower for k in ["tests passed", "syntax ok", "fixed", "success"]):
-                    votes.append("success")
-                else:
-                    votes.append("pass")
+            # Tur başına prompt maliyeti sabit kalsın: eski mesajlar tek özete katlanır
+            if len(state.messages) > 2 * settings.MESSAGE_WINDOW:
+                state.compact(settings.MESSAGE_WINDOW)
 
             if self.consensus.evaluate(self.config.strategy, votes):
                 logger.info("✅ Swarm consensus reached", extra={"run_id": state.run_id})
@@ -64,3 +71,29 @@ class SwarmCoordinator:
 
         logger.warning("⚠️ Swarm max rounds reached without consensus", extra={"run_id": state.run_id})
         return state
+
+    async def _run_parallel_round(self, state: NeuralState, round_no: int, votes: List[str]) -> NeuralState:
+        """Tüm ajanları aynı state'in kopyalarında eşzamanlı çalıştırıp sonuçları birleştirir.
+
+        Tur süresi en yavaş ajan kadardır; artifact'ler ajan sırasıyla last-write-wins.
+        """
+        base_budget = state.budget_used
+        results = await asyncio.gather(*(agent.execute(state.fork()) for agent in self.config.agents))
+        for agent, child in zip(self.config.agents, results):
+            # Ajanın bu turda ürettiği son mesaj oyunu belirler
+            new_msgs = child.delta.messages
+            content = new_msgs[-1].content if new_msgs else ""
+            state.merge(child)
+            state.budget_used += child.budget_used - base_budget
+            self._record(agent, content, round_no, votes)
+        return state
+
+    def _record(self, agent: BaseNode, content: str, round_no: int, votes: List[str]) -> None:
+        self.conversation.add(
+            role="assistant",
+            content=content,
+            agent_name=agent.name,
+            metadata={"round": round_no},
+        )
+
+        votes.append("success" if _is_success(content) else "pass")
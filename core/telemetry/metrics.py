@@ -1,6 +1,7 @@
 """
 Prometheus-compatible metrics collection for PROJECT_HIVE.
 """
+from collections import Counter as _Tally, defaultdict, deque
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -16,6 +17,20 @@ except ImportError:
     PROMETHEUS_AVAILABLE = False
     print("⚠️ Prometheus client not installed. Running in no-op mode.")
 
+# Fallback histogramlarında label başına tutulan son gözlem sayısı
+_HISTOGRAM_WINDOW = 1000
+# Thread buffer'ı bu kadar olay biriktirince Prometheus metriklerine aktarılır
+_FLUSH_EVERY = 256
+# Metrik başına en fazla label kombinasyonu (time series). Aşan yeni seriler sayaç ve
+# histogramlarda "other"a toplanır; gauge'larda örnek düşürülür ve sayılır (son değer toplanamaz).
+_MAX_SERIES_PER_METRIC = 10000
+_SERIES_LIMITS = {
+    # Tenant sayısı sınırsız büyüyebilir: yalnızca ilk 100 tenant ayrı seri alır
+    "budget_used_usd": 100,
+    "budget_remaining_usd": 100,
+}
+_OVERFLOW_LABEL = "other"
+
 
 class MetricType(Enum):
     COUNTER = "counter"
@@ -35,6 +50,26 @@ class MetricConfig:
     quantiles: Optional[List[float]] = None  # For summaries
 
 
+class _MetricBuffer:
+    """Bir thread'in Prometheus'a henüz aktarılmamış sayaç artışları ve gözlemleri."""
+
+    __slots__ = ("lock", "counts", "observations", "pending")
+
+    def __init__(self):
+        # Yalnızca sahibi thread ve nadiren flush eden taraf alır; pratikte çekişmesiz
+        self.lock = threading.Lock()
+        self.counts: Dict[tuple, float] = defaultdict(float)
+        self.observations: Dict[tuple, List[float]] = defaultdict(list)
+        self.pending = 0
+
+    def drain(self):
+        with self.lock:
+            counts, self.counts = self.counts, defaultdict(float)
+            observations, self.observations = self.observations, defaultdict(list)
+            self.pending = 0
+        return counts, observations
+
+
 class EnterpriseMetrics:
     """
     Production-ready metrics collector with Prometheus support.
@@ -44,6 +79,15 @@ class EnterpriseMetrics:
         self.prefix = prefix
         self.metrics: Dict[str, Any] = {}
         self._lock = threading.RLock()
+        # Prometheus yolunda thread-local buffer'lar (paylaşılan child kilitlerine periyodik yazım)
+        self._tls = threading.local()
+        self._buffers: List[_MetricBuffer] = []
+        # (metric, sıralı label tuple) -> bağlı child; labels() lookup'ı tekrar edilmez
+        self._children: Dict[tuple, Any] = {}
+        # Metrik başına görülen label kombinasyonları (cardinality sınırı)
+        self._series: Dict[str, set] = {}
+        # Seri sınırı yüzünden düşürülen gauge örnekleri (metrik başına)
+        self._dropped_samples: Dict[str, int] = _Tally()
         self._init_core_metrics()
 
     # -------------------------------
@@ -89,7 +133,7 @@ class EnterpriseMetrics:
                 description="Duration of agent executions in seconds",
                 metric_type=MetricType.HISTOGRAM,
                 labels=["agent_name"],
-                buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0]
+                buckets=[1.0, 5.0, 30.0]
             ),
             MetricConfig(
                 name="agent_tokens_used",
@@ -110,7 +154,7 @@ class EnterpriseMetrics:
                 description="Pipeline execution duration",
                 metric_type=MetricType.HISTOGRAM,
                 labels=["pipeline_type"],
-                buckets=[10.0, 30.0, 60.0, 300.0, 600.0, 1800.0]
+                buckets=[30.0, 300.0, 1800.0]
             ),
 
             # Self-Healing Metrics
@@ -124,7 +168,8 @@ class EnterpriseMetrics:
                 name="self_healing_duration_seconds",
                 description="Time spent on self-healing",
                 metric_type=MetricType.HISTOGRAM,
-                labels=["error_type"]
+                labels=["error_type"],
+                buckets=[5.0, 30.0, 120.0]
             ),
 
             # LLM Metrics
@@ -138,7 +183,8 @@ class EnterpriseMetrics:
                 name="llm_call_duration_seconds",
                 description="LLM API call duration",
                 metric_type=MetricType.HISTOGRAM,
-                labels=["provider", "model"]
+                labels=["provider", "model"],
+                buckets=[1.0, 5.0, 15.0, 60.0]
             ),
 
             # Budget Metrics
@@ -196,77 +242,133 @@ class EnterpriseMetrics:
                     quantiles=config.quantiles or [(0.5, 0.05), (0.9, 0.01), (0.99, 0.001)]
                 )
         else:
-            # Fallback to simple dictionary storage
-            self.metrics[full_name] = {
-                "type": config.metric_type,
-                "description": config.description,
-                "labels": config.labels,
-                "values": {}
-            }
+            # Fallback to simple dictionary storage.
+            # Güncellemeler tek C çağrısıyla yapılır (GIL altında atomik), kilit gerekmez:
+            # sayaçlar Counter._count_elements, histogramlar deque.append, gauge'lar dict set.
+            with self._lock:
+                self.metrics[full_name] = {
+                    "type": config.metric_type,
+                    "description": config.description,
+                    "labels": config.labels,
+                    "values": _Tally() if config.metric_type == MetricType.COUNTER else {}
+                }
 
     def record_agent_execution(self, agent_name: str, duration: float,
                                status: str = "success", tokens: int = 0,
                                model: str = "unknown"):
         """Record agent execution metrics."""
-        with self._lock:
-            # Increment execution counter
-            self._inc_counter("agent_executions_total",
-                              {"agent_name": agent_name, "status": status})
+        # Increment execution counter
+        self._inc_counter("agent_executions_total",
+                          {"agent_name": agent_name, "status": status})
 
-            # Record duration
-            self._observe_histogram("agent_execution_duration_seconds",
-                                    duration, {"agent_name": agent_name})
+        # Record duration
+        self._observe_histogram("agent_execution_duration_seconds",
+                                duration, {"agent_name": agent_name})
 
-            # Record tokens if provided
-            if tokens > 0:
-                self._inc_counter("agent_tokens_used",
-                                  {"agent_name": agent_name, "model": model},
-                                  increment=tokens)
+        # Record tokens if provided
+        if tokens > 0:
+            self._inc_counter("agent_tokens_used",
+                              {"agent_name": agent_name, "model": model},
+                              increment=tokens)
 
     def record_pipeline_run(self, pipeline_type: str, duration: float,
                             status: str = "completed"):
         """Record pipeline execution metrics."""
-        with self._lock:
-            self._inc_counter("pipeline_runs_total",
-                              {"pipeline_type": pipeline_type, "status": status})
-            self._observe_histogram("pipeline_duration_seconds",
-                                    duration, {"pipeline_type": pipeline_type})
+        self._inc_counter("pipeline_runs_total",
+                          {"pipeline_type": pipeline_type, "status": status})
+        self._observe_histogram("pipeline_duration_seconds",
+                                duration, {"pipeline_type": pipeline_type})
 
     def record_self_healing(self, error_type: str, duration: float,
                             success: bool):
         """Record self-healing metrics."""
-        with self._lock:
-            self._inc_counter("self_healing_attempts_total",
-                              {"error_type": error_type, "success": str(success)})
-            self._observe_histogram("self_healing_duration_seconds",
-                                    duration, {"error_type": error_type})
+        self._inc_counter("self_healing_attempts_total",
+                          {"error_type": error_type, "success": str(success)})
+        self._observe_histogram("self_healing_duration_seconds",
+                                duration, {"error_type": error_type})
 
     def record_llm_call(self, provider: str, model: str, duration: float,
                         status: str = "success", tokens_used: int = 0):
         """Record LLM API call metrics."""
-        with self._lock:
-            self._inc_counter("llm_calls_total",
-                              {"provider": provider, "model": model, "status": status})
-            self._observe_histogram("llm_call_duration_seconds",
-                                    duration, {"provider": provider, "model": model})
+        self._inc_counter("llm_calls_total",
+                          {"provider": provider, "model": model, "status": status})
+        self._observe_histogram("llm_call_duration_seconds",
+                                duration, {"provider": provider, "model": model})
 
     def update_budget(self, tenant_id: str, used: float, remaining: float):
         """Update budget metrics."""
-        with self._lock:
-            self._set_gauge("budget_used_usd", used, {"tenant_id": tenant_id})
-            self._set_gauge("budget_remaining_usd", remaining, {"tenant_id": tenant_id})
+        self._set_gauge("budget_used_usd", used, {"tenant_id": tenant_id})
+        self._set_gauge("budget_remaining_usd", remaining, {"tenant_id": tenant_id})
 
     def update_queue_size(self, queue_name: str, size: int):
         """Update queue size metric."""
-        with self._lock:
-            self._set_gauge("queue_size", size, {"queue_name": queue_name})
+        self._set_gauge("queue_size", size, {"queue_name": queue_name})
 
     def update_active_agents(self, count: int):
         """Update active agents count."""
+        self._set_gauge("active_agents", count)
+
+    def _buffer(self) -> _MetricBuffer:
+        buf = getattr(self._tls, "buf", None)
+        if buf is None:
+            buf = self._tls.buf = _MetricBuffer()
+            with self._lock:
+                self._buffers.append(buf)
+        return buf
+
+    def _child(self, full_name: str, label_key: tuple):
+        """Label'lara bağlı Prometheus child'ı (ilk kullanımda çözülüp saklanır)."""
+        key = (full_name, label_key)
+        child = self._children.get(key)
+        if child is None:
+            metric = self.metrics[full_name]
+            # Label'sız metrikler doğrudan kullanılır
+            child = metric.labels(**dict(label_key)) if label_key else metric
+            child = self._children.setdefault(key, child)
+        return child
+
+    def _flush_buffer(self, buf: _MetricBuffer) -> None:
+        counts, observations = buf.drain()
+        for (full_name, label_key), amount in counts.items():
+            self._child(full_name, label_key).inc(amount)
+        for (full_name, label_key), values in observations.items():
+            child = self._child(full_name, label_key)
+            for value in values:
+                child.observe(value)
+
+    def flush(self) -> None:
+        """Tüm thread buffer'larını Prometheus metriklerine aktarır (export öncesi çağrılır)."""
+        if not PROMETHEUS_AVAILABLE:
+            return
         with self._lock:
-            self._set_gauge("active_agents", count)
+            buffers = list(self._buffers)
+        for buf in buffers:
+            self._flush_buffer(buf)
+
+    def _label_key(
+        self, name: str, full_name: str, labels: Optional[Dict[str, str]], fold: bool = True
+    ) -> Optional[tuple]:
+        """Sıralı label tuple'ı.
 
-    def _inc_counter(self, name: str, labels: Dict[str, str], increment: float = 1.0):
+        Seri sınırını aşan yeni kombinasyonlar ``fold=True`` ise "other"a düşer,
+        aksi halde None döner (çağıran örneği atar).
+        """
+        if not labels:
+            return ()
+        label_key = tuple(sorted(labels.items()))
+        seen = self._series.get(full_name)
+        if seen is None:
+            seen = self._series.setdefault(full_name, set())
+        if label_key in seen:
+            return label_key
+        if len(seen) >= _SERIES_LIMITS.get(name, _MAX_SERIES_PER_METRIC):
+            if not fold:
+                return None
+            return tuple((label, _OVERFLOW_LABEL) for label, _ in label_key)
+        seen.add(label_key)
+        return label_key
+
+    def _inc_counter(self, name: str, labels: Dict[str, str], increment: float = 1):
         """Increment a counter metric."""
         full_name = f"{self.prefix}{name}"
         metric = self.metrics.get(full_name)
@@ -274,13 +376,24 @@ class EnterpriseMetrics:
         if metric is None:
             return
 
+        label_key = self._label_key(name, full_name, labels)
+
         if PROMETHEUS_AVAILABLE:
-            metric.labels(**labels).inc(increment)
+            buf = self._buffer()
+            with buf.lock:
+                buf.counts[(full_name, label_key)] += increment
+                buf.pending += 1
+                full = buf.pending >= _FLUSH_EVERY
+            if full:
+                self._flush_buffer(buf)
         else:
-            label_key = tuple(sorted(labels.items()))
-            if label_key not in metric["values"]:
-                metric["values"][label_key] = 0
-            metric["values"][label_key] += increment
+            if increment == 1:
+                # Sık yol: tek C çağrısı, kilitsiz
+                metric["values"].update((label_key,))
+            else:
+                # Ağırlıklı artışlar (token vb.): oku-değiştir-yaz kilit altında
+                with self._lock:
+                    metric["values"][label_key] += increment
 
     def _observe_histogram(self, name: str, value: float, labels: Dict[str, str]):
         """Observe a histogram metric."""
@@ -290,13 +403,21 @@ class EnterpriseMetrics:
         if metric is None:
             return
 
+        label_key = self._label_key(name, full_name, labels)
+
         if PROMETHEUS_AVAILABLE:
-            metric.labels(**labels).observe(value)
+            buf = self._buffer()
+            with buf.lock:
+                buf.observations[(full_name, label_key)].append(value)
+                buf.pending += 1
+                full = buf.pending >= _FLUSH_EVERY
+            if full:
+                self._flush_buffer(buf)
         else:
-            label_key = tuple(sorted(labels.items()))
-            if label_key not in metric["values"]:
-                metric["values"][label_key] = []
-            metric["values"][label_key].append(value)
+            window = metric["values"].get(label_key)
+            if window is None:
+                window = metric["values"].setdefault(label_key, deque(maxlen=_HISTOGRAM_WINDOW))
+            window.append(value)
 
     def _set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """Set a gauge metric value."""
@@ -306,17 +427,21 @@ class EnterpriseMetrics:
         if metric is None:
             return
 
-        labels = labels or {}
+        label_key = self._label_key(name, full_name, labels, fold=False)
+        if label_key is None:
+            # Gauge son değerdir; farklı serileri tek "other"da birleştirmek yanıltıcı olur
+            self._dropped_samples.update((full_name,))
+            return
 
         if PROMETHEUS_AVAILABLE:
-            metric.labels(**labels).set(value)
+            self._child(full_name, label_key).set(value)
         else:
-            label_key = tuple(sorted(labels.items()))
             metric["values"][label_key] = value
 
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get a summary of all metrics for dashboard display."""
         summary = {}
+        self.flush()
 
         with self._lock:
             for name, metric in self.metrics.items():
@@ -328,11 +453,17 @@ class EnterpriseMetrics:
                         "value": "Available via /metrics endpoint"
                     }
                 else:
+                    values = metric.get("values", {})
+                    if metric.get("type") == MetricType.HISTOGRAM:
+                        # Gözlem pencerelerinin anlık kopyası (dashboard list bekler)
+                        values = {key: list(window) for key, window in list(values.items())}
                     summary[name] = {
                         "type": metric.get("type", "unknown"),
                         "description": metric.get("description", ""),
-                        "values": metric.get("values", {})
+                        "values": values
                     }
+                if self._dropped_samples.get(name):
+                    summary[name]["dropped_samples"] = self._dropped_samples[name]
 
         return summary
 
@@ -342,6 +473,7 @@ class EnterpriseMetrics:
             return "# Prometheus client not available\n"
 
         from prometheus_client import generate_latest
+        self.flush()
         return generate_latest().decode('utf-8')
 
 
@@ -0,0 +1,15 @@
+"""
+LLM yanıtlarından markdown kod bloğu ayıklama.
+
+Tek derlenmiş regex; yanıtı ``split("```")`` ile parçalara bölmez.
+"""
+import re
+
+CODE_FENCE_RE = re.compile(r"```(?:python|javascript|py|js)?[ \t]*\n?(.*?)\n?```", re.DOTALL)
+
+
+def extract_code(content: str) -> str:
+    """İlk kod bloğunun içeriğini döndürür; blok yoksa tüm içerik (strip'li)."""
+    # Dil etiketi sadece açılış fence'inden silinir, kodun içinden değil.
+    match = CODE_FENCE_RE.search(content)
+    return match.group(1).strip() if match else content.strip()
@@ -0,0 +1,17 @@
+"""
+Üretilen kod için paylaşılan compile cache'i.
+
+DevAgent ve TesterAgent aynı kaynağı derliyor; sonuç (code object veya
+SyntaxError) kaynak metne göre bir kez hesaplanır ve tekrar kullanılır.
+"""
+import functools
+from types import CodeType
+from typing import Optional, Tuple
+
+
+@functools.lru_cache(maxsize=128)
+def compile_cached(src: str, filename: str) -> Tuple[Optional[CodeType], Optional[SyntaxError]]:
+    try:
+        return compile(src, filename, "exec"), None
+    except SyntaxError as e:
+        return None, e
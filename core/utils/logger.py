@@ -1,23 +1,65 @@
-import logging, sys, json
-from datetime import datetime
+import atexit, logging, queue, sys, json, threading, time
+from logging.handlers import QueueHandler, QueueListener
 from core.config import settings
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class JSONFormatter(logging.Formatter):
+    # Saniye kısmı saniyede bir biçimlendirilir; aynı saniyedeki kayıtlar paylaşır
+    _last_second = -1
+    _last_prefix = ""
+
+    def _timestamp(self, record):
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._last_second = second
+        return f"{self._last_prefix}.{int(record.msecs):03d}Z"
+
     def format(self, record):
-        data={"timestamp":datetime.utcnow().isoformat()+"Z","level":record.levelname,
+        data={"timestamp":self._timestamp(record),"level":record.levelname,
               "logger":record.name,"message":record.getMessage()}
         if hasattr(record,"run_id"): data["run_id"]=record.run_id
         if hasattr(record,"agent"): data["agent"]=record.agent
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(data, default=str).decode()
         return json.dumps(data)
 
+class _BoundedQueueHandler(QueueHandler):
+    """Kuyruk doluysa kaydı düşürür; log patlamasında çağıran thread bloklanmaz."""
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+# Tüm logger'lar kayıtları tek kuyruğa bırakır; stdout'a yalnızca listener thread'i yazar
+_LOG_QUEUE = queue.Queue(maxsize=10000)
+_LISTENER = None
+_LISTENER_LOCK = threading.Lock()
+
+def _start_listener():
+    global _LISTENER
+    with _LISTENER_LOCK:
+        if _LISTENER is None:
+            h=logging.StreamHandler(sys.stdout)
+            if settings.ENV=="production":
+                h.setFormatter(JSONFormatter())
+            else:
+                h.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+            _LISTENER=QueueListener(_LOG_QUEUE, h)
+            _LISTENER.start()
+            atexit.register(_LISTENER.stop)
+
 def get_logger(name):
     logger=logging.getLogger(name)
     if not logger.handlers:
         logger.setLevel(settings.LOG_LEVEL)
-        h=logging.StreamHandler(sys.stdout)
-        if settings.ENV=="production":
-            h.setFormatter(JSONFormatter())
-        else:
-            h.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
-        logger.addHandler(h)
+        _start_listener()
+        logger.addHandler(_BoundedQueueHandler(_LOG_QUEUE))
     return logger
@@ -1,10 +1,14 @@
 """
 API dependencies and authentication.
 """
-from typing import Optional
+from functools import lru_cache
+from typing import FrozenSet, Optional
 from fastapi import Header, HTTPException, status, Depends
 from fastapi.security import APIKeyHeader, APIKeyQuery
+import hashlib
 import os
+import secrets
+import time
 
 from core.telemetry.metrics import metrics
 
@@ -12,15 +16,33 @@ from core.telemetry.metrics import metrics
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 api_key_query = APIKeyQuery(name="api_key", auto_error=False)
 
+# Geçerli anahtarlar bu aralıkta bir env'den yeniden okunur (rotasyon desteği)
+_API_KEYS_TTL_SECONDS = 60
+# Process başına gizli anahtar: saklanan özetler dışarıdan tahmin/ön-hesap edilemez
+_SERVER_PEPPER = secrets.token_bytes(32)
+
+
+def _key_digest(api_key: str) -> bytes:
+    return hashlib.blake2b(api_key.encode("utf-8"), digest_size=16, key=_SERVER_PEPPER).digest()
+
+
+@lru_cache(maxsize=1)
+def _load_api_keys(epoch: int) -> FrozenSet[bytes]:
+    # Get API keys from environment or use default for development
+    keys = os.getenv("HIVE_API_KEYS", "dev_key_123,test_key_456").split(",")
+    return frozenset(_key_digest(k) for k in keys)
+
+
+def valid_api_keys() -> FrozenSet[bytes]:
+    """Geçerli anahtarların keyed BLAKE2b özetleri; küme TTL dolunca bir kez yenilenir."""
+    return _load_api_keys(int(time.monotonic() // _API_KEYS_TTL_SECONDS))
+
 
 async def get_api_key(
         api_key_header: Optional[str] = Depends(api_key_header),
         api_key_query: Optional[str] = Depends(api_key_query),
 ) -> str:
     """Get and validate API key."""
-    # Get API key from environment or use default for development
-    valid_api_keys = os.getenv("HIVE_API_KEYS", "dev_key_123,test_key_456").split(",")
-
     api_key = api_key_header or api_key_query
 
     if not api_key:
@@ -29,7 +51,8 @@ async def get_api_key(
             detail="API key is required"
         )
 
-    if api_key not in valid_api_keys:
+    # Ham anahtar karşılaştırılmaz: özet kümesinde arama, byte byte erken çıkış sızıntısı yok
+    if _key_digest(api_key) not in valid_api_keys():
         # Record failed authentication attempt
         metrics.increment_counter("api_auth_failed")
 
@@ -48,7 +71,8 @@ async def rate_limit_check(api_key: str = Depends(get_api_key)):
     """Simple rate limiting check."""
     # In production, use Redis or similar for rate limiting
     # For now, we just track the metric
-    metrics.increment_counter("api_requests", tags={"api_key": api_key[:8]})
+    # API anahtarı label yapılmaz: her anahtar ayrı time series olurdu
+    metrics.increment_counter("api_requests")
 
     # Basic rate limiting: max 100 requests per minute per key
     # This would be implemented with Redis in production
@@ -5,7 +5,7 @@ from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional
 import uuid
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import WebSocket
 
 from fastapi import FastAPI, HTTPException, status, BackgroundTasks, Depends
@@ -14,6 +14,7 @@ from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
+from core.llm.http import aclose_client
 from core.queue import task_queue
 from core.telemetry.metrics import metrics
 from observability.session_replay import session_replay
@@ -47,6 +48,9 @@ async def lifespan(app: FastAPI):
     # Stop task queue
     task_queue.stop()
 
+    # Close pooled LLM HTTP connections
+    await aclose_client()
+
     # Record shutdown metric
     metrics.increment_counter("api_shutdowns")
 
@@ -152,9 +156,9 @@ async def run_pipeline(
     )
 
     # Record metric
-    metrics.increment_counter("pipeline_starts", tags={
-        "pipeline_type": request.pipeline_type.value,
-        "tenant": tenant_id
+    # Tenant label yapılmaz: her tenant ayrı time series olurdu
+    metrics.increment_counter("pipeline_starts", labels={
+        "pipeline_type": request.pipeline_type.value
     })
 
     # Return task ID immediately
@@ -164,7 +168,7 @@ async def run_pipeline(
         "message": "Pipeline task submitted successfully",
         "poll_url": f"/api/v1/tasks/{task_id}",
         "websocket_url": f"/ws/tasks/{task_id}",
-        "created_at": datetime.now().isoformat()
+        "created_at": datetime.now(timezone.utc).isoformat()
     }
 
 
@@ -372,8 +376,12 @@ async def generic_exception_handler(request, exc):
     )
 
 
-# Static files for dashboard (optional)
-app.mount("/dashboard", StaticFiles(directory="interfaces/dashboard/static", html=True), name="dashboard")
+# Static files for dashboard (optional): klasör yoksa import patlamasın, istekler 404 döner
+app.mount(
+    "/dashboard",
+    StaticFiles(directory="interfaces/dashboard/static", html=True, check_dir=False),
+    name="dashboard",
+)
 
 # Run the application
 if __name__ == "__main__":
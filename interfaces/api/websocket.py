@@ -2,6 +2,7 @@
 WebSocket support for real-time task updates.
 """
 import json
+from datetime import datetime, timezone
 from typing import Dict, Any
 from fastapi import WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
@@ -113,7 +114,7 @@ async def websocket_endpoint(websocket: WebSocket, task_id: str = None):
                 await websocket.send_json({
                     "type": "queue_stats",
                     "stats": stats,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": datetime.now(timezone.utc).isoformat()
                 })
 
                 import asyncio
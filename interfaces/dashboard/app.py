@@ -5,7 +5,7 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 from pathlib import Path
 import sys
@@ -1091,7 +1091,7 @@ class HiveDashboard:
                     "goal": goal,
                     "pipeline_type": pipeline_type,
                     "status": "running",
-                    "start_time": datetime.now().isoformat()
+                    "start_time": datetime.now(timezone.utc).isoformat()
                 }
 
                 st.success(f"Pipeline started with Run ID: `{run_id}`")
@@ -1142,7 +1142,7 @@ class HiveDashboard:
                 session_replay.end_session(run_id, "completed")
 
                 st.session_state.current_run["status"] = "completed"
-                st.session_state.current_run["end_time"] = datetime.now().isoformat()
+                st.session_state.current_run["end_time"] = datetime.now(timezone.utc).isoformat()
 
                 st.success("✅ Pipeline completed successfully!")
 
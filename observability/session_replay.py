@@ -3,7 +3,7 @@ Session replay engine for debugging and auditing agent interactions.
 """
 import json
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, AsyncGenerator
 from pathlib import Path
 from dataclasses import dataclass, asdict
@@ -117,7 +117,7 @@ class SessionReplayEngine:
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
                 session_id, run_id, goal, pipeline_type,
-                datetime.now().isoformat(), "running",
+                datetime.now(timezone.utc).isoformat(), "running",
                 json.dumps(metadata or {})
             ))
 
@@ -133,7 +133,7 @@ class SessionReplayEngine:
             "run_id": run_id,
             "goal": goal,
             "pipeline_type": pipeline_type,
-            "start_time": datetime.now().isoformat(),
+            "start_time": datetime.now(timezone.utc).isoformat(),
             "status": "running",
             "metadata": metadata or {},
             "events": []
@@ -148,12 +148,12 @@ class SessionReplayEngine:
                     duration_ms: Optional[float] = None,
                     parent_event_id: Optional[str] = None) -> str:
         """Record an event in a session."""
-        event_id = f"{session_id}_{int(datetime.now().timestamp() * 1000)}_{event_type.value}"
+        event_id = f"{session_id}_{int(datetime.now(timezone.utc).timestamp() * 1000)}_{event_type.value}"
         event = SessionEvent(
             session_id=session_id,
             event_id=event_id,
             event_type=event_type,
-            timestamp=datetime.now(),
+            timestamp=datetime.now(timezone.utc),
             agent_name=agent_name,
             data=data or {},
             duration_ms=duration_ms,
@@ -189,7 +189,7 @@ class SessionReplayEngine:
     def end_session(self, session_id: str, status: str = "completed",
                    error: Optional[str] = None):
         """End a session recording."""
-        end_time = datetime.now()
+        end_time = datetime.now(timezone.utc)
 
         if SQLITE_AVAILABLE:
             conn = sqlite3.connect(self.db_path)
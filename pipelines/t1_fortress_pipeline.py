@@ -50,7 +50,7 @@ class T1FortressPipeline:
         state = await self.coordinator.orchestrate(state)
 
         # 2) Policy check (Fortress Layer)
-        last_msg = state.messages[-1]["content"] if state.messages else ""
+        last_msg = state.messages[-1].content if state.messages else ""
 
         # LLM Çıktısını kontrol et
         violations = self.policy.check_llm_output(last_msg, {"goal": goal})
@@ -58,9 +58,9 @@ class T1FortressPipeline:
         # Kod Artifact'lerini kontrol et
         code_map = state.artifacts.get("generated_code", {})
         if isinstance(code_map, dict):
-            for filename, code in code_map.items():
-                # Policy Engine'e string olarak kod gönderiyoruz
-                violations.extend(self.policy.check_code(str(code), {"goal": goal}))
+            # Policy Engine'e string olarak kod gönderiyoruz; tarama loop'u bloklamasın
+            codes = [str(code) for code in code_map.values()]
+            violations.extend(await self.policy.check_code_batch(codes, {"goal": goal}))
 
         # İhlalleri State'e ekle
         if violations:
@@ -1,7 +1,7 @@
 import asyncio
 
 from core.graph_engine.state import NeuralState
-from core.graph_engine.engine import NeuralGraphEngine
+from core.graph_engine.engine import GraphEngine
 from core.graph_engine.node import BaseNode
 
 
@@ -9,21 +9,22 @@ class HelloNode(BaseNode):
     def __init__(self) -> None:
         super().__init__("hello")
 
-    async def execute(self, state: NeuralState) -> NeuralState:
-        state.add_message(role="system", content="Hello from graph engine", agent="hello_node")
+    async def run(self, state: NeuralState) -> NeuralState:
+        state.add_message(role="system", content="Hello from graph engine", name="hello_node")
         return state
 
 
 async def main() -> None:
     state = NeuralState(goal="Demo sprint 0 graph")
 
-    engine = NeuralGraphEngine()
-    engine.add_node(HelloNode())
+    engine = GraphEngine()
+    engine.register_node(HelloNode())
+    engine.set_start("hello")
 
     final_state = await engine.execute(state)
     print("Messages:")
     for m in final_state.messages:
-        print(f"- [{m.role}] {m.agent}: {m.content}")
+        print(f"- [{m.role}] {m.name}: {m.content}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,7 @@
 import asyncio
-from pathlib import Path
 
 from core.graph_engine.state import NeuralState
-from core.graph_engine.engine import NeuralGraphEngine
+from core.graph_engine.engine import GraphEngine
 from core.graph_engine.node import BaseNode
 from agents.cognitive.supervisor_agent import SupervisorAgent
 from agents.cognitive.architect_agent import ArchitectAgent
@@ -16,7 +15,7 @@ class SupervisorNode(BaseNode):
         super().__init__("supervisor")
         self.agent = SupervisorAgent()
 
-    async def execute(self, state: NeuralState) -> NeuralState:
+    async def run(self, state: NeuralState) -> NeuralState:
         return await self.agent.execute(state)
 
 
@@ -25,34 +24,34 @@ class ArchitectNode(BaseNode):
         super().__init__("architect")
         self.agent = ArchitectAgent()
 
-    async def execute(self, state: NeuralState) -> NeuralState:
+    async def run(self, state: NeuralState) -> NeuralState:
         return await self.agent.execute(state)
 
 
 class DevNode(BaseNode):
-    def __init__(self, output_dir: Path) -> None:
+    def __init__(self) -> None:
         super().__init__("dev")
-        self.agent = DevAgent(output_dir=output_dir)
+        self.agent = DevAgent()
 
-    async def execute(self, state: NeuralState) -> NeuralState:
+    async def run(self, state: NeuralState) -> NeuralState:
         return await self.agent.execute(state)
 
 
 class TesterNode(BaseNode):
-    def __init__(self, project_root: Path) -> None:
+    def __init__(self) -> None:
         super().__init__("tester")
-        self.agent = TesterAgent(project_root=project_root)
+        self.agent = TesterAgent()
 
-    async def execute(self, state: NeuralState) -> NeuralState:
+    async def run(self, state: NeuralState) -> NeuralState:
         return await self.agent.execute(state)
 
 
 class DebuggerNode(BaseNode):
-    def __init__(self, project_root: Path) -> None:
+    def __init__(self) -> None:
         super().__init__("debugger")
-        self.agent = DebuggerAgent(project_root=project_root)
+        self.agent = DebuggerAgent()
 
-    async def execute(self, state: NeuralState) -> NeuralState:
+    async def run(self, state: NeuralState) -> NeuralState:
         return await self.agent.execute(state)
 
 
@@ -60,15 +59,13 @@ async def main() -> None:
     goal = "Konsoldan çalışan, dört işlem yapabilen basit bir Python hesap makinesi yaz."
     state = NeuralState(goal=goal)
 
-    project_root = Path(".")
-    output_dir = Path("output")
-
-    engine = NeuralGraphEngine()
-    engine.add_node(SupervisorNode())
-    engine.add_node(ArchitectNode())
-    engine.add_node(DevNode(output_dir=output_dir))
-    engine.add_node(TesterNode(project_root=project_root))
-    engine.add_node(DebuggerNode(project_root=project_root))
+    engine = GraphEngine()
+    engine.register_node(SupervisorNode())
+    engine.register_node(ArchitectNode())
+    engine.register_node(DevNode())
+    engine.register_node(TesterNode())
+    engine.register_node(DebuggerNode())
+    engine.set_start("supervisor")
 
     engine.add_edge("supervisor", "architect")
     engine.add_edge("architect", "dev")
@@ -76,7 +73,7 @@ async def main() -> None:
     engine.add_edge(
         "tester",
         "debugger",
-        condition=lambda s: s.artifacts.get("test_result") == "fail",
+        condition=lambda s: not s.artifacts.get("test_results", {}).get("success", True),
     )
 
     final_state = await engine.execute(state)
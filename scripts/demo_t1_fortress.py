@@ -48,7 +48,7 @@ async def main():
     if final_state.errors:
         print(f"🐞 Errors ({len(final_state.errors)}):")
         for err in final_state.errors:
-            print(f"   - [{err.get('type')}] {err.get('message')}")
+            print(f"   - [{err.type}] {err.message}")
     else:
         print("✅ No errors logged.")
 
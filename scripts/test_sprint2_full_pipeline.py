@@ -36,7 +36,7 @@ async def main():
             state = await agent.execute(state)
             # Son mesajı göster
             if state.messages:
-                print(f"   🗣️  Output: {state.messages[-1]['content'][:100]}...")
+                print(f"   🗣️  Output: {state.messages[-1].content[:100]}...")
         except Exception as e:
             print(f"   ❌ Error: {e}")
             import traceback
@@ -75,7 +75,7 @@ async def main():
         print("❌ No generated code found in artifacts.")
 
     # State Dump (Opsiyonel debug)
-    # print(json.dumps(state.to_dict(), indent=2, default=str))
+    # print(state.to_json().decode())
 
 
 if __name__ == "__main__":
@@ -5,6 +5,7 @@ import os
 import sys
 from typing import Dict, Any
 
+from core.utils.compile_cache import compile_cached
 from core.utils.logger import get_logger
 
 logger = get_logger("SandboxRunner")
@@ -16,6 +17,15 @@ class SandboxRunner:
     def run_python(self, code: str, timeout: int = 5) -> Dict[str, Any]:
         logger.info("🔒 Executing code in sandbox...")
 
+        # Syntax hatası için interpreter başlatmaya gerek yok: süreç içinde derle.
+        _, syntax_error = compile_cached(code, "<sandbox>")
+        if syntax_error is not None:
+            logger.info("Sandbox skipped: syntax error", extra={"success": False})
+            return {
+                "success": False,
+                "output": f"SyntaxError: {syntax_error.msg} (line {syntax_error.lineno})",
+            }
+
         with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as tmp:
             tmp.write(code)
             tmp_path = tmp.name
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("uvicorn")
+
+from fastapi import HTTPException  # noqa: E402
+
+from interfaces.api import dependencies  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _keys(monkeypatch):
+    monkeypatch.setenv("HIVE_API_KEYS", "alpha,beta")
+    dependencies._load_api_keys.cache_clear()
+    yield
+    dependencies._load_api_keys.cache_clear()
+
+
+def test_valid_key_is_accepted_via_header_or_query():
+    assert asyncio.run(dependencies.get_api_key("alpha", None)) == "alpha"
+    assert asyncio.run(dependencies.get_api_key(None, "beta")) == "beta"
+
+
+@pytest.mark.parametrize("key", ["gamma", "alph", "alpha ", "ALPHA"])
+def test_unknown_key_is_rejected(key):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(dependencies.get_api_key(key, None))
+    assert exc.value.status_code == 401
+
+
+def test_missing_key_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(dependencies.get_api_key(None, None))
+    assert exc.value.status_code == 401
+
+
+def test_only_digests_are_stored():
+    stored = dependencies.valid_api_keys()
+    assert b"alpha" not in stored
+    assert dependencies._key_digest("alpha") in stored
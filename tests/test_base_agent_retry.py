@@ -0,0 +1,56 @@
+import asyncio
+
+from agents.base.base_agent import AgentConfig, BaseAgent
+from core.graph_engine.state import NeuralState
+from core.llm.models import LLMResponse
+
+
+class _EchoAgent(BaseAgent):
+    async def _build_user_prompt(self, state: NeuralState) -> str:
+        return state.goal
+
+
+class _FlakyRouter:
+    """İlk ``failures`` çağrıda router'ın yuttuğu hata yanıtını döndürür."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    async def route(self, state, messages=None, timeout=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return LLMResponse(content="CRITICAL ERROR", model="error", provider="none", error="down")
+        return LLMResponse(content="ok", model="llama3", provider="ollama")
+
+
+def _agent(router: _FlakyRouter, **overrides) -> _EchoAgent:
+    config = AgentConfig(name="EchoAgent", role="Tester", goal="echo", **overrides)
+    agent = _EchoAgent(config)
+    agent.router = router
+    return agent
+
+
+def _route(agent: _EchoAgent):
+    return asyncio.run(agent._route_with_retry(NeuralState(goal="hi"), [{"role": "user", "content": "hi"}]))
+
+
+def test_error_response_is_retried_by_default():
+    router = _FlakyRouter(failures=1)
+    response = _route(_agent(router, max_retries=1))
+    assert response.content == "ok"
+    assert router.calls == 2
+
+
+def test_retries_stop_at_max_retries_and_return_last_error():
+    router = _FlakyRouter(failures=5)
+    response = _route(_agent(router, max_retries=2))
+    assert response.model == "error"
+    assert router.calls == 3
+
+
+def test_error_response_retry_can_be_disabled():
+    router = _FlakyRouter(failures=1)
+    response = _route(_agent(router, max_retries=3, retry_on_error_response=False))
+    assert response.model == "error"
+    assert router.calls == 1
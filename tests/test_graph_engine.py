@@ -0,0 +1,97 @@
+import asyncio
+
+from core.graph_engine import engine as engine_module
+from core.graph_engine.engine import GraphEngine
+from core.graph_engine.node import BaseNode
+from core.graph_engine.state import NeuralState
+
+
+class _Say(BaseNode):
+    def __init__(self, name: str, calls: list) -> None:
+        super().__init__(name)
+        self.calls = calls
+
+    async def run(self, state: NeuralState) -> NeuralState:
+        self.calls.append(self.name)
+        state.add_message(role="assistant", content=f"{self.name} done", name=self.name)
+        state.artifacts[self.name] = True
+        return state
+
+
+class _Boom(BaseNode):
+    async def run(self, state: NeuralState) -> NeuralState:
+        raise ValueError("branch exploded")
+
+
+def _engine(calls: list, *names: str) -> GraphEngine:
+    engine = GraphEngine()
+    for name in names:
+        engine.register_node(_Say(name, calls))
+    return engine
+
+
+def test_fan_out_runs_branches_and_joins():
+    calls: list = []
+    engine = _engine(calls, "start", "left", "right", "join")
+    engine.set_start("start")
+    engine.add_edge("start", "left", parallel_group="g")
+    engine.add_edge("start", "right", parallel_group="g")
+    engine.add_edge("left", "join")
+
+    state = asyncio.run(engine.execute(NeuralState(goal="fan")))
+
+    assert sorted(calls) == ["join", "left", "right", "start"]
+    assert calls[-1] == "join"
+    assert [m.name for m in state.messages][0] == "start"
+    assert {m.name for m in state.messages} == {"start", "left", "right", "join"}
+    assert {"left", "right", "join"} <= set(state.artifacts)
+    assert not state.errors
+
+
+def test_failing_branch_is_recorded_not_raised():
+    calls: list = []
+    engine = _engine(calls, "start", "left", "join")
+    engine.register_node(_Boom("bad"))
+    engine.set_start("start")
+    engine.add_edge("start", "left", parallel_group="g")
+    engine.add_edge("start", "bad", parallel_group="g")
+    engine.add_edge("left", "join")
+
+    state = asyncio.run(engine.execute(NeuralState(goal="fan")))
+
+    assert [e.type for e in state.errors] == ["node_error"]
+    assert state.errors[0].details["node"] == "bad"
+    # Sağlam dalın çıktısı birleştirilir; hata sonrası join'e geçilmez
+    assert "left" in state.artifacts
+    assert "join" not in calls
+
+
+def test_sequential_node_failure_is_recorded():
+    engine = GraphEngine()
+    engine.register_node(_Boom("bad"))
+    engine.set_start("bad")
+
+    state = asyncio.run(engine.execute(NeuralState(goal="seq")))
+
+    assert [e.type for e in state.errors] == ["node_error"]
+
+
+def test_parallel_targets_count_towards_visit_cap(monkeypatch):
+    monkeypatch.setattr(engine_module, "_MAX_NODE_VISITS", 5)
+    calls: list = []
+    engine = _engine(calls, "a", "b", "c", "e", "f")
+    engine.set_start("a")
+    # "c" yalnızca fan-out hedefi olarak, tur başına iki kez çalışır
+    engine.add_edge("a", "b", parallel_group="g1")
+    engine.add_edge("a", "c", parallel_group="g1")
+    engine.add_edge("b", "e")
+    engine.add_edge("e", "c", parallel_group="g2")
+    engine.add_edge("e", "f", parallel_group="g2")
+    engine.add_edge("c", "a")
+
+    state = asyncio.run(engine.execute(NeuralState(goal="cycle")))
+
+    assert [e.type for e in state.errors] == ["graph_cycle"]
+    assert state.errors[0].details["node"] == "c"
+    assert calls.count("c") == 5
+    assert calls.count("a") == 3
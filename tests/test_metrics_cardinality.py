@@ -0,0 +1,34 @@
+import pytest
+
+from core.telemetry import metrics as metrics_module
+from core.telemetry.metrics import EnterpriseMetrics, PROMETHEUS_AVAILABLE
+
+pytestmark = pytest.mark.skipif(PROMETHEUS_AVAILABLE, reason="fallback (no-op) store is inspected directly")
+
+
+def test_counter_series_over_cap_fold_into_other(monkeypatch):
+    monkeypatch.setitem(metrics_module._SERIES_LIMITS, "agent_executions_total", 2)
+    m = EnterpriseMetrics()
+    for agent in ("a", "b", "c", "d"):
+        m.record_agent_execution(agent, 0.1)
+    m.record_agent_execution("a", 0.1)
+
+    values = m.metrics["hive_agent_executions_total"]["values"]
+    assert values[(("agent_name", "a"), ("status", "success"))] == 2
+    assert values[(("agent_name", "b"), ("status", "success"))] == 1
+    assert values[(("agent_name", "other"), ("status", "other"))] == 2
+    assert len(values) == 3
+
+
+def test_gauge_samples_over_cap_are_dropped_and_counted():
+    m = EnterpriseMetrics()
+    for i in range(105):
+        m.update_budget(f"tenant-{i}", used=float(i), remaining=1.0)
+    m.update_budget("tenant-0", used=42.0, remaining=1.0)
+
+    values = m.metrics["hive_budget_used_usd"]["values"]
+    assert len(values) == 100
+    assert values[(("tenant_id", "tenant-0"),)] == 42.0
+    summary = m.get_metrics_summary()
+    assert summary["hive_budget_used_usd"]["dropped_samples"] == 5
+    assert "dropped_samples" not in summary["hive_queue_size"]
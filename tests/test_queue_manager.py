@@ -0,0 +1,50 @@
+import asyncio
+
+from core.llm.http import get_client
+from core.queue.manager import TaskQueueManager
+
+
+async def _open_client():
+    return get_client()
+
+
+def _use_thread_loop(manager: TaskQueueManager):
+    loop = manager._thread_loop()
+    client = loop.run_until_complete(_open_client())
+    return loop, client
+
+
+def _start_loops(manager: TaskQueueManager):
+    futures = [manager.executor.submit(_use_thread_loop, manager) for _ in range(manager.max_workers)]
+    return [f.result(timeout=5.0) for f in futures]
+
+
+def test_stop_closes_worker_loops_and_clients():
+    manager = TaskQueueManager(max_workers=2)
+    opened = _start_loops(manager)
+
+    manager.stop()
+
+    for loop, client in opened:
+        assert loop.is_closed()
+        assert client.is_closed
+
+
+def test_stop_inside_running_loop():
+    # FastAPI lifespan stop()'u kendi çalışan loop'undan çağırır
+    manager = TaskQueueManager(max_workers=2)
+    opened = _start_loops(manager)
+
+    async def lifespan_shutdown():
+        manager.stop()
+
+    asyncio.run(lifespan_shutdown())
+
+    for loop, client in opened:
+        assert loop.is_closed()
+        assert client.is_closed
+
+
+def test_stop_without_tasks():
+    manager = TaskQueueManager(max_workers=3)
+    manager.stop()
@@ -0,0 +1,37 @@
+import pytest
+
+from core.llm.router import LLMRouter
+
+
+def _has_pii(text: str) -> bool:
+    return LLMRouter()._contains_pii([{"role": "user", "content": text}])
+
+
+@pytest.mark.parametrize("text", [
+    "mail me at jane.doe@example.com",
+    "call 555-123-4567 tomorrow",
+    "call 555.123.4567",
+    "call (555) 123-4567",
+    "reach me on +1 555 123 4567",
+    "reach me on +905551234567",
+    "ssn 123-45-6789",
+    "IBAN DE89 3704 0044 0532 0130 00",
+])
+def test_detects_pii(text):
+    assert _has_pii(text)
+
+
+@pytest.mark.parametrize("text", [
+    "order 5551234567 shipped",
+    "timestamp 1697040000123 in ms",
+    "assert add(1234567890, 1) == 1234567891",
+    "version 1.2.3 released",
+    "range 555-123 only",
+    "mixed 555-123.4567 separators",
+])
+def test_plain_numbers_are_not_pii(text):
+    assert not _has_pii(text)
+
+
+def test_non_string_content_is_scanned():
+    assert LLMRouter()._contains_pii([{"role": "user", "content": ["a@b.io"]}])
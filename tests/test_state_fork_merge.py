@@ -0,0 +1,56 @@
+from core.config import settings
+from core.graph_engine.state import NeuralState, StateDelta
+
+
+def test_merge_appends_only_messages_added_after_fork():
+    state = NeuralState()
+    state.add_message("user", "before")
+    fork = state.fork()
+    fork.add_message("assistant", "after")
+    fork.add_error("x", "boom")
+
+    state.merge(fork)
+
+    assert [m.content for m in state.messages] == ["before", "after"]
+    assert [e.message for e in state.errors] == ["boom"]
+
+
+def test_merge_survives_message_eviction():
+    # Fork'ta maxlen taşınca eski indeks tabanlı birleştirme mesaj kaybediyordu
+    state = NeuralState()
+    for i in range(settings.MAX_MESSAGES):
+        state.add_message("user", str(i))
+    fork = state.fork()
+    for i in range(3):
+        fork.add_message("assistant", f"new{i}")
+
+    state.merge(fork)
+
+    assert [m.content for m in list(state.messages)[-4:]] == [str(settings.MAX_MESSAGES - 1), "new0", "new1", "new2"]
+    assert len(state.messages) == settings.MAX_MESSAGES
+
+
+def test_nested_fork_records_reach_the_root():
+    state = NeuralState()
+    child = state.fork()
+    grandchild = child.fork()
+    grandchild.add_message("assistant", "deep")
+    child.merge(grandchild)
+
+    state.merge(child)
+
+    assert [m.content for m in state.messages] == ["deep"]
+
+
+def test_apply_delta_sets_deletes_and_appends():
+    state = NeuralState()
+    state.artifacts["test_results"] = {"success": False}
+    delta = StateDelta(artifacts_set={"generated_code": {"a.py": "x = 1"}}, artifacts_del={"test_results"})
+    fork = state.fork()
+    fork.add_message("assistant", "fixed")
+    delta.messages.extend(fork.delta.messages)
+
+    state.apply(delta)
+
+    assert state.artifacts == {"generated_code": {"a.py": "x = 1"}}
+    assert [m.content for m in state.messages] == ["fixed"]